@@ -1,26 +1,185 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
+import orjson
 import requests
 from requests import Session, Response
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout, RequestException
+from urllib3.util.retry import Retry
 
-from .log import get_logger
+from .log import get_logger, short_repr
 
 """
 API client (DP-1.1.2.1)
 
 fetch_next_pass:
   - GET https://sat.terrestre.ar/passes/{id}?lat=<lat>&lon=<lon>&limit=1
-  - One retry on timeout
-  - Non-200 or bad JSON => return None
+  - One retry (connect/read timeout or transient 502/503/504), done by urllib3 on the adapter;
+    never for 429, nor for a 503 carrying Retry-After
+  - Reuses one module-level keep-alive Session across calls (one host, pooled connections)
+  - Conditional GET: sends If-None-Match / If-Modified-Since from the last 200; a 304 reuses
+    that response's pass object (headers-only response, no JSON parse)
+  - 429/503 carrying a Retry-After header => RetryAfter(seconds): the caller backs off for
+    exactly the server-requested time instead of guessing
+  - Non-200 (other than 304), bad JSON, or a pass object of the wrong shape => return None
+    (shape checked once here: rise/culmination/set each with an int utc_timestamp and a
+    numeric-or-string alt)
   - Log errors to STDERR via logger (C-5)
+
+submit_fetch:
+  - Start one fetch on a small shared thread pool (Future), so a multi-satellite refresh costs
+    ~1 RTT instead of N x RTT; the worker count matches the Session's connection pool
 """
 
 # This function gets the logger for the API client.
 _LOG = get_logger(__name__)
 _BASE_URL = "https://sat.terrestre.ar"
+_USER_AGENT = "satlight/0.1 (+https://github.com/christinakneis/satlights)"
+_POOL_MAXSIZE = 8  # upper bound on concurrent connections kept alive to the API host
+
+# Statuses whose Retry-After header we pass back to the caller.
+_RETRY_AFTER_STATUSES = frozenset((429, 503))
+
+
+# urllib3 Retry that never retries a response carrying Retry-After on those statuses: the
+# server asked us to wait, so an immediate second GET would only spend quota. The response
+# goes straight back, and fetch_next_pass turns it into RetryAfter for the caller's backoff.
+class _Retry(Retry):
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if has_retry_after and status_code in _RETRY_AFTER_STATUSES:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+# One retry at the connection layer, for timeouts and transient gateway statuses. 429 is not
+# retried here at all (rate limited: retrying at once cannot help). Retry-After is not slept
+# on either: a long server-requested wait must not block the tick.
+_RETRY = _Retry(
+    total=1,
+    connect=1,
+    read=1,
+    status=1,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    backoff_factor=0.2,
+    respect_retry_after_header=False,
+    raise_on_status=False,  # hand back the final response; non-200 is handled below
+)
+
+
+# A fetch refused by the server with an explicit wait (Retry-After), in seconds from now.
+@dataclass(frozen=True, slots=True)
+class RetryAfter:
+    seconds: float
+
+
+# What a per-id fetcher returns: a pass object, a server-requested wait, or None (no pass/error).
+FetchResult = Union[Dict[str, Any], RetryAfter, None]
+
+
+# Parts every pass object must carry, and the value types accepted for their timestamp and
+# altitude: the same int/float/numeric-string values visibility._parse_pass_fields converts.
+_PASS_PARTS = ("rise", "culmination", "set")
+_FIELD_TYPES = (int, float, str)
+
+
+# This function checks that a pass field is an int/float/numeric string with a finite value.
+def _finite_number(v: Any) -> bool:
+    if type(v) not in _FIELD_TYPES:
+        return False
+    try:
+        return math.isfinite(float(v))  # rejects "nan"/"inf" and non-numeric strings
+    except ValueError:
+        return False
+
+
+# This function checks a decoded pass object's shape (what the visibility math reads from it).
+def _valid_pass_shape(obj: Dict[str, Any]) -> bool:
+    """
+    Exact type checks on the decoder's plain dict/int/float/str output (no schema engine),
+    plus finite numeric values, so a pass that can never be evaluated is not cached.
+    """
+    for part in _PASS_PARTS:
+        p = obj.get(part)
+        if type(p) is not dict:
+            return False
+        if not (_finite_number(p.get("utc_timestamp")) and _finite_number(p.get("alt"))):
+            return False
+    return True
+
+
+# Validators + pass object from the last 200 per (norad_id, lat, lon) query, for conditional GETs.
+@dataclass(slots=True)
+class _Validated:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    pass_obj: Dict[str, Any]
+
+
+_VALIDATED: Dict[Tuple[int, float, float], _Validated] = {}
+
+# Shared Session (lazily built). Reusing it keeps the TCP+TLS connection to the API host alive
+# between satellites and ticks instead of paying a fresh handshake on every fetch.
+_SESSION: Optional[Session] = None
+
+# Shared fetch pool (lazily built). Threads are only spawned as fetches are submitted,
+# so the effective worker count is min(_POOL_MAXSIZE, fetches in flight).
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+# This function returns the shared keep-alive Session, building it on first use.
+def _get_session() -> Session:
+    global _SESSION
+    if _SESSION is None:
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_MAXSIZE, max_retries=_RETRY)
+        s.mount("https://", adapter)
+        # Keep-alive is the HTTP/1.1 default; being explicit avoids proxy quirks.
+        s.headers.update({"User-Agent": _USER_AGENT, "Connection": "keep-alive"})
+        _SESSION = s
+    return _SESSION
+
+
+# This function returns the shared fetch thread pool, building it on first use.
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(
+            max_workers=_POOL_MAXSIZE, thread_name_prefix="satlight-fetch"
+        )
+    return _EXECUTOR
+
+
+# This function builds the conditional-request headers for a query we have a validated copy of.
+def _conditional_headers(cached: Optional[_Validated]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+# This function parses a Retry-After header (delta-seconds or HTTP-date) into seconds from now.
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdecimal():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
 
 
 # This function builds the URL for the API client.
@@ -36,56 +195,96 @@ def fetch_next_pass(
     *,
     timeout: float = 5.0,
     session: Optional[Session] = None,
-) -> Optional[Dict[str, Any]]:
+) -> FetchResult:
     """
     DP-1.1.2.1: Fetch the next pass for a given NORAD ID at (lat, lon).
 
     Returns:
-        dict (pass object) on success, or None if no pass / error.
+        dict (pass object) on success, RetryAfter if the server asked us to wait
+        (429/503 + Retry-After), or None if no pass / error.
     """
     params = {"lat": lat, "lon": lon, "limit": 1}
     url = _build_url(norad_id)
-    s = session or requests.Session()
-
-    # try up to 2 attempts total on timeout
-    attempts = 2
-    for attempt in range(1, attempts + 1):
-        try:
-            resp: Response = s.get(url, params=params, timeout=timeout)
-            if (
-                resp.status_code != 200
-            ):  # 200 is the status code for a successful response. If the status code is not 200, it means there was an error.
-                _LOG.error("passes endpoint non-200 (id=%s, status=%s)", norad_id, resp.status_code)
-                return None
-            try:  # Try to parse the response as JSON. If it fails, it means the response is not valid JSON.
-                data = resp.json()
-            except ValueError as e:
-                _LOG.error("invalid JSON from passes endpoint (id=%s): %s", norad_id, e)
-                return None
-
-            if not isinstance(data, list) or not data:
-                # No passes found
-                return None
-
-            first = data[0]
-            if not isinstance(
-                first, dict
-            ):  # If the first item is not a dictionary, log the error and return None.
-                _LOG.error("unexpected JSON shape for passes (id=%s): %r", norad_id, first)
-                return None
-            return first
-
-        except Timeout:  # If the request times out, retry the request once.
-            if attempt < attempts:
-                _LOG.warning("timeout calling passes endpoint (id=%s), retrying once...", norad_id)
-                continue
-            _LOG.error("timeout calling passes endpoint after retry (id=%s)", norad_id)
-            return None
-        except (
-            RequestException
-        ) as e:  # If the request fails for any other reason, log the error and return None.
-            _LOG.error("request error calling passes endpoint (id=%s): %s", norad_id, e)
-            return None
-
-    # Should never reach here
-    return None
+    s = session or _get_session()
+    key = (norad_id, lat, lon)
+    cached = _VALIDATED.get(key)
+
+    # Retries (timeouts, transient statuses) happen inside the session's adapter.
+    try:
+        resp: Response = s.get(
+            url, params=params, timeout=timeout, headers=_conditional_headers(cached)
+        )
+    except (
+        Timeout
+    ):  # If the request still times out after the retry, log the error and return None.
+        _LOG.error("timeout calling passes endpoint after retry (id=%s)", norad_id)
+        return None
+    except (
+        RequestException
+    ) as e:  # If the request fails for any other reason, log the error and return None.
+        _LOG.error("request error calling passes endpoint (id=%s): %s", norad_id, e)
+        return None
+
+    if resp.status_code == 304 and cached is not None:
+        # Not modified: the server confirmed our last pass object is still current.
+        return cached.pass_obj
+    if resp.status_code in _RETRY_AFTER_STATUSES:
+        retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+        if retry_after is not None:
+            _LOG.error(
+                "passes endpoint asked to retry later (id=%s, status=%s, retry_after=%.0fs)",
+                norad_id,
+                resp.status_code,
+                retry_after,
+            )
+            return RetryAfter(retry_after)
+    if (
+        resp.status_code != 200
+    ):  # 200 is the status code for a successful response. If the status code is not 200, it means there was an error.
+        _LOG.error("passes endpoint non-200 (id=%s, status=%s)", norad_id, resp.status_code)
+        return None
+    try:  # Try to parse the response as JSON. If it fails, it means the response is not valid JSON.
+        # orjson parses the raw bytes directly (no charset detection, C-speed decode).
+        data = orjson.loads(resp.content)
+    except orjson.JSONDecodeError as e:
+        _LOG.error("invalid JSON from passes endpoint (id=%s): %s", norad_id, e)
+        return None
+
+    if not isinstance(data, list) or not data:
+        # No passes found
+        return None
+
+    first = data[0]
+    if not isinstance(
+        first, dict
+    ):  # If the first item is not a dictionary, log the error and return None.
+        _LOG.error("unexpected JSON shape for passes (id=%s): %s", norad_id, short_repr(first))
+        return None
+    if not _valid_pass_shape(first):
+        _LOG.error(
+            "pass object missing rise/culmination/set fields (id=%s): %s",
+            norad_id,
+            short_repr(first),
+        )
+        return None
+
+    # Remember validators (if the server sent any) so the next fetch can be conditional.
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        _VALIDATED[key] = _Validated(etag, last_modified, first)
+    else:
+        _VALIDATED.pop(key, None)
+    return first
+
+
+# This function starts fetching the next pass for one NORAD ID on the shared pool.
+def submit_fetch(
+    norad_id: int,
+    lat: float,
+    lon: float,
+    *,
+    fetcher: Callable[[int, float, float], FetchResult] = fetch_next_pass,
+) -> Future[FetchResult]:
+    """Non-blocking fetch_next_pass: the Future resolves to its result (or fetcher's exception)."""
+    return _get_executor().submit(fetcher, norad_id, lat, lon)
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Union
 
 import yaml
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, PrivateAttr, field_validator, model_validator
+
+from .log import get_logger
 
 """
 Config layer
 - DP-1.1.1.1: load_yaml(path) -> dict
 - DP-1.1.1.2: AppConfig (Pydantic v2) + validate_config(raw) -> AppConfig
+- RuntimeCfg: frozen, slotted plain snapshot of a validated AppConfig (AppConfig.to_runtime()),
+  used by the 10 s loop so Pydantic stays at boot and off the per-tick path
 
 Maps to:
   FR-1.1.1, CN-1.2
-  C-6 (allowed sinks enforced here)
+  C-6 (allowed sinks enforced here; each output is parsed once into a typed SinkSpec)
 """
 
 
@@ -46,10 +53,76 @@ def load_yaml(path: str) -> Dict[str, Any]:
 
 # ----- DP-1.1.1.2: Pydantic config model -----
 
+_LOG = get_logger(__name__)
+
 # Allowed outputs (C-6): exactly 'stdout', 'file:<path>', or 'tcp:<host>:<port>'
 _TCP_RE = re.compile(r"^tcp:([^:]+):(\d{1,5})$")  # simple host:port (no IPv6 colons)
 
 
+# Parsed output destinations (C-6). str() gives back the configured form, for log messages.
+@dataclass(frozen=True)
+class StdoutSpec:
+    def __str__(self) -> str:
+        return "stdout"
+
+
+@dataclass(frozen=True)
+class FileSpec:
+    path: str
+
+    def __str__(self) -> str:
+        return f"file:{self.path}"
+
+
+@dataclass(frozen=True)
+class TcpSpec:
+    host: str
+    port: int
+
+    def __str__(self) -> str:
+        return f"tcp:{self.host}:{self.port}"
+
+
+SinkSpec = Union[StdoutSpec, FileSpec, TcpSpec]
+
+
+# Plain runtime snapshot of a validated AppConfig (same attribute names the runtime reads).
+@dataclass(frozen=True, slots=True)
+class RuntimeCfg:
+    lat: float
+    lon: float
+    satellites: Mapping[int, str]  # read-only view of the NORAD_ID -> color map
+    sat_items: tuple[tuple[int, str], ...]  # (id, color) pairs in configured order
+    pair_by_id: Mapping[int, tuple[int, str]]  # id -> the same pair objects as sat_items
+    parsed_outputs: tuple[SinkSpec, ...]
+    min_elevation_deg: float
+    cache_file: Optional[str] = None
+
+
+# This function parses one output string into a SinkSpec, raising ValueError if it is not allowed.
+def _parse_output(s: str) -> SinkSpec:
+    if s == "stdout":
+        return StdoutSpec()
+    if s.startswith("file:"):
+        path = s.removeprefix("file:")
+        if not path:
+            raise ValueError("file sink must be 'file:<path>' with a non-empty path")
+        return FileSpec(path)
+    m = _TCP_RE.match(s)
+    if m:
+        host, port_str = m.groups()
+        port = int(port_str)
+        if not (1 <= port <= 65535):
+            raise ValueError("tcp port must be 1..65535")
+        if not host or ":" in host:
+            # keep host simple (no colons) per spec; users can use DNS/IP
+            raise ValueError("tcp host must be non-empty and must not contain ':'")
+        return TcpSpec(host, port)
+    raise ValueError(
+        "outputs entries must be exactly 'stdout', 'file:<path>', or 'tcp:<host>:<port>'"
+    )
+
+
 # Pydantic config model for DP-1.1.1.2
 class AppConfig(BaseModel):
     lat: float
@@ -57,6 +130,15 @@ class AppConfig(BaseModel):
     satellites: dict[int, str]
     outputs: list[str]
     min_elevation_deg: float = 10.0  # default per spec
+    cache_file: Optional[str] = None  # optional; persist cached passes across restarts
+
+    # Derived views, rebuilt on access when their source field is no longer the object they were
+    # built from (an O(1) identity check): model_copy(update=...) and attribute assignment skip
+    # the validators but always bind a new object. Mutating the lists in place is not tracked.
+    _outputs_src: Optional[list[str]] = PrivateAttr(default=None)
+    _parsed_outputs: list[SinkSpec] = PrivateAttr(default_factory=list)
+    _satellites_src: Optional[dict[int, str]] = PrivateAttr(default=None)
+    _pair_by_id: dict[int, tuple[int, str]] = PrivateAttr(default_factory=dict)
 
     # --- Validators ---
 
@@ -85,6 +167,14 @@ class AppConfig(BaseModel):
             raise ValueError("min_elevation_deg must be between 0 and 90 inclusive")
         return v
 
+    # This validator checks if the cache file path, when given, is a non-empty string.
+    @field_validator("cache_file")
+    @classmethod
+    def _cache_file_non_empty(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and not v.strip():
+            raise ValueError("cache_file must be a non-empty path when set")
+        return v
+
     # This validator checks if the satellites keys are positive integers and if the color is a non-empty string.
     @field_validator("satellites")
     @classmethod
@@ -101,7 +191,8 @@ class AppConfig(BaseModel):
                 raise ValueError(f"satellites keys must be positive integers; got {k!r}")
             if not isinstance(color, str) or not color.strip():
                 raise ValueError(f"color for NORAD {k} must be a non-empty string")
-            normalized[k] = color.strip()
+            # Interned: every result pair and log line shares one string object per color.
+            normalized[k] = sys.intern(color.strip())
         return normalized
 
     # This validator checks if the outputs are exactly 'stdout', 'file:<path>', or 'tcp:<host>:<port>'.
@@ -110,32 +201,62 @@ class AppConfig(BaseModel):
     def _outputs_allowed_only(cls, items: list[str]) -> list[str]:
         if not isinstance(items, list) or len(items) == 0:
             raise ValueError("outputs must be a non-empty list")
-        out: list[str] = []
-        for s in items:
-            if s == "stdout":
-                out.append(s)
-                continue
-            if s.startswith("file:"):
-                path = s.removeprefix("file:")
-                if not path:
-                    raise ValueError("file sink must be 'file:<path>' with a non-empty path")
-                out.append(s)
-                continue
-            m = _TCP_RE.match(s)
-            if m:
-                host, port_str = m.groups()
-                port = int(port_str)
-                if not (1 <= port <= 65535):
-                    raise ValueError("tcp port must be 1..65535")
-                if not host or ":" in host:
-                    # keep host simple (no colons) per spec; users can use DNS/IP
-                    raise ValueError("tcp host must be non-empty and must not contain ':'")
-                out.append(s)
-                continue
-            raise ValueError(
-                "outputs entries must be exactly 'stdout', 'file:<path>', or 'tcp:<host>:<port>'"
-            )
-        return out
+        # Drop repeated entries (keep first occurrence) so a sink is never written twice per tick.
+        dedup = list(dict.fromkeys(items))  # insertion-ordered unique entries
+        if len(dedup) != len(items):
+            _LOG.warning("duplicate outputs ignored: %s -> %s", items, dedup)
+        return dedup
+
+    # This validator parses each output into a typed sink spec, rejecting anything outside
+    # 'stdout', 'file:<path>', or 'tcp:<host>:<port>' (C-6).
+    @model_validator(mode="after")
+    def _parse_outputs(self) -> "AppConfig":
+        _ = self.parsed_outputs  # builds (and so validates) the cached specs
+        return self
+
+    # This validator builds one (id, color) pair per satellite, shared by every tick's result.
+    @model_validator(mode="after")
+    def _build_pairs(self) -> "AppConfig":
+        _ = self.pair_by_id  # builds the cached pairs
+        return self
+
+    @property
+    def pair_by_id(self) -> Mapping[int, tuple[int, str]]:
+        """NORAD_ID -> prebuilt (id, color) pair; visible_now returns these objects as-is."""
+        if self._satellites_src is not self.satellites:
+            self._pair_by_id = {
+                sat_id: (sat_id, color) for sat_id, color in self.satellites.items()
+            }
+            self._satellites_src = self.satellites
+        return self._pair_by_id
+
+    @property
+    def parsed_outputs(self) -> list[SinkSpec]:
+        """Outputs as typed specs (StdoutSpec / FileSpec / TcpSpec), in configured order."""
+        if self._outputs_src is not self.outputs:
+            self._parsed_outputs = [_parse_output(s) for s in self.outputs]
+            self._outputs_src = self.outputs
+        return self._parsed_outputs
+
+    # This method snapshots the validated model into a plain RuntimeCfg for the hot loop.
+    def to_runtime(self) -> RuntimeCfg:
+        """Build the frozen runtime view (slot attribute access, no Pydantic machinery)."""
+        satellites = dict(self.satellites)
+        pairs = dict(self.pair_by_id)
+        return RuntimeCfg(
+            lat=self.lat,
+            lon=self.lon,
+            satellites=MappingProxyType(satellites),
+            sat_items=tuple(pairs.values()),
+            pair_by_id=MappingProxyType(pairs),
+            parsed_outputs=tuple(self.parsed_outputs),
+            min_elevation_deg=self.min_elevation_deg,
+            cache_file=self.cache_file,
+        )
+
+
+# Either config shape can drive a tick: the validated model, or its runtime snapshot.
+ConfigLike = Union[AppConfig, RuntimeCfg]
 
 
 # This function validates and normalizes a raw dictionary into an AppConfig object using Pydantic's model_validate.
@@ -144,4 +265,14 @@ def validate_config(raw: dict[str, Any]) -> AppConfig:
     return AppConfig.model_validate(raw)
 
 
-__all__ = ["load_yaml", "AppConfig", "validate_config"]
+__all__ = [
+    "load_yaml",
+    "AppConfig",
+    "ConfigLike",
+    "RuntimeCfg",
+    "validate_config",
+    "SinkSpec",
+    "StdoutSpec",
+    "FileSpec",
+    "TcpSpec",
+]
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import time
-from typing import Callable, List
+from functools import partial
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
-from .config import AppConfig
-from .visibility import visible_now
+from .config import AppConfig, FileSpec, SinkSpec, StdoutSpec, TcpSpec
+from .visibility import load_cache, next_state_change_ts, save_cache, visible_now
 from .format import format_line
 from . import sinks as _sinks
 from .log import get_logger
@@ -15,29 +16,83 @@ Emitter (DP-1.2.2)
   * Query visible_now (DP-1.1.2)
   * If any: format one line (DP-1.2.1) and fan out to sinks (C-6)
   * Errors in one sink do not block others; log to STDERR (C-5)
+  * Sleep never exceeds the period, but is cut short to wake exactly when a cached pass
+    enters/leaves the threshold window or expires (next_state_change_ts)
+- Parsed outputs (AppConfig.parsed_outputs) are compiled into sink callables once per run
 """
 
 _LOG = get_logger(__name__)
 _PERIOD_SEC = 10.0
+_MIN_SLEEP_SEC = 1.0  # floor when waking early for a state change (avoids busy re-ticks)
 
+# A compiled sink: takes the formatted line and its newline-terminated UTF-8 encoding (built
+# once per tick, shared by every byte-oriented sink) and writes one of them to one destination.
+Sink = Callable[[str, bytes], None]
 
-# This function emits the line to the outputs.
-def _emit_to_outputs(outputs: List[str], line: str) -> None:
-    for out in outputs:
+
+# These functions adapt a text sink (uses the line) or a byte sink (uses the encoded bytes).
+def _text_sink(fn: Callable[[str], None]) -> Sink:
+    return lambda line, data: fn(line)
+
+
+def _bytes_sink(fn: Callable[[bytes], None]) -> Sink:
+    return lambda line, data: fn(data)
+
+
+# Spec type -> sink builder (one dict lookup per output instead of a branch chain).
+# Builders resolve the sink functions when called, so each run picks up the current module
+# attributes.
+_SINK_BUILDERS: Dict[type, Callable[[Any], Sink]] = {
+    StdoutSpec: lambda spec: _text_sink(_sinks.stdout_sink),
+    FileSpec: lambda spec: _text_sink(partial(_sinks.file_sink, spec.path)),
+    TcpSpec: lambda spec: _bytes_sink(partial(_sinks.tcp_sink, spec.host, spec.port)),
+}
+
+
+# This function compiles the parsed output specs into sink callables (once per run).
+def _compile_sinks(specs: Sequence[SinkSpec]) -> List[Tuple[str, Sink]]:
+    """
+    Turn each parsed output (C-6) into a (label, callable) pair, e.g.
+    FileSpec("/tmp/x") -> ("file:/tmp/x", <calls file_sink("/tmp/x", line)>).
+    The label is kept for error messages.
+    """
+    compiled: List[Tuple[str, Sink]] = []
+    for spec in specs:
+        build = _SINK_BUILDERS.get(type(spec))
+        if build is None:
+            # Should never happen because DP-1.1.1.2 validated outputs (C-6)
+            _LOG.error("disallowed sink encountered at runtime: %s", spec)
+            continue
+        compiled.append((str(spec), build(spec)))
+    return compiled
+
+
+# This function emits the line to the compiled sinks.
+def _emit_to_outputs(sinks: List[Tuple[str, Sink]], line: str) -> None:
+    data = (line + "\n").encode("utf-8")  # encoded once for all byte sinks (immutable, shared)
+    for label, sink in sinks:
         try:
-            if out == "stdout":  # If the output is stdout, emit the line to the standard output.
-                _sinks.stdout_sink(line)
-            elif out.startswith("file:"):  # If the output is a file, emit the line to the file.
-                path = out.split(":", 1)[1]
-                _sinks.file_sink(path, line)
-            elif out.startswith("tcp:"):  # If the output is a TCP, emit the line to the TCP.
-                _, host, port_str = out.split(":", 2)
-                _sinks.tcp_sink(host, int(port_str), line)
-            else:
-                # Should never happen because DP-1.1.1.2 validated outputs (C-6)
-                _LOG.error("disallowed sink encountered at runtime: %s", out)
+            sink(line, data)
         except Exception as e:  # C-5: error to STDERR; continue with other sinks
-            _LOG.error("sink failure for %s: %s", out, e)
+            _LOG.error("sink failure for %s: %s", label, e)
+    # stdout/file writes are buffered: one flush per destination for the whole tick
+    try:
+        _sinks.flush_sinks()
+    except Exception as e:  # C-5
+        _LOG.error("sink flush failure: %s", e)
+
+
+# This function computes how long to sleep after a tick's work.
+def _tick_delay(elapsed: float, now_utc: int, min_elev: float) -> float:
+    """
+    Remainder of the 10 s period (drift-free), shortened to the next cached state change
+    if one falls inside it (clamped to >= _MIN_SLEEP_SEC). May be <= 0 if work overran.
+    """
+    delay = _PERIOD_SEC - elapsed
+    change_ts = next_state_change_ts(now_utc, min_elev)
+    if change_ts is not None:
+        delay = min(delay, max(_MIN_SLEEP_SEC, float(change_ts - now_utc)))
+    return delay
 
 
 # This function runs the main loop.
@@ -48,13 +103,20 @@ def run_forever(
     sleep_fn: Callable[[float], None] = time.sleep,
     now_fn: Callable[[], float] = time.time,
 ) -> None:
-    """Main loop: maintain a ~10 s cadence (drift-free)."""
+    """Main loop: maintain a ~10 s cadence (drift-free), waking early for cached pass events."""
+    rt = cfg.to_runtime()  # plain frozen snapshot: no Pydantic attribute access per tick
+    sinks = _compile_sinks(rt.parsed_outputs)
+    _sinks.use_block_buffered_stdout()  # flushed once per tick by _emit_to_outputs
+    if rt.cache_file:  # warm restart: reuse passes saved by a previous run
+        load_cache(rt.cache_file, int(now_fn()))
     while True:
         t0 = monotonic_fn()  # Get the start time.
 
         pairs = visible_now(
-            cfg, now_fn=now_fn, mono_fn=monotonic_fn, max_fetches_per_tick=1
+            rt, now_fn=now_fn, mono_fn=monotonic_fn, max_fetches_per_tick=1, sat_items=rt.sat_items
         )  # Get the satellite and color pairs from the visible_now function.
+        if rt.cache_file:  # no-op unless this tick stored a new pass
+            save_cache(rt.cache_file, int(now_fn()))
         emitted = False
         line = ""
         if pairs:
@@ -62,11 +124,11 @@ def run_forever(
                 pairs
             )  # Format the pairs into a line using the format_line function.
             if line:  # If the line is not empty, emit the line to the outputs.
-                _emit_to_outputs(cfg.outputs, line)
+                _emit_to_outputs(sinks, line)
                 emitted = True
 
         elapsed = monotonic_fn() - t0  # Get the elapsed time.
-        delay = _PERIOD_SEC - elapsed  # Get the delay.
+        delay = _tick_delay(elapsed, int(now_fn()), rt.min_elevation_deg)  # Get the delay.
         # Heartbeat to STDERR (INFO): one line per tick
         _LOG.info(
             "tick: sats=%d, emitted=%s, work=%.3fs, sleep=%.3fs",
@@ -93,19 +155,28 @@ def run_once(
     Single-tick helper (useful for CLI --once and tests).
     If do_sleep=False, executes one cycle without the final sleep.
     """
+    sinks = _compile_sinks(cfg.parsed_outputs)
+    if cfg.cache_file:
+        load_cache(cfg.cache_file, int(now_fn()))
     t0 = monotonic_fn()
 
-    pairs = visible_now(cfg, now_fn=now_fn, mono_fn=monotonic_fn, max_fetches_per_tick=1)
+    # Single shot: no later tick would pick up a slow fetch, so wait for it (the fetch itself
+    # is bounded by its HTTP timeout and one retry).
+    pairs = visible_now(
+        cfg, now_fn=now_fn, mono_fn=monotonic_fn, max_fetches_per_tick=1, fetch_wait_sec=None
+    )
+    if cfg.cache_file:
+        save_cache(cfg.cache_file, int(now_fn()))
     emitted = False
     line = ""
     if pairs:
         line = format_line(pairs)
         if line:
-            _emit_to_outputs(cfg.outputs, line)
+            _emit_to_outputs(sinks, line)
             emitted = True
 
     elapsed = monotonic_fn() - t0
-    delay = _PERIOD_SEC - elapsed
+    delay = _tick_delay(elapsed, int(now_fn()), cfg.min_elevation_deg)
     # Heartbeat to STDERR (INFO): one line for this single tick
     _LOG.info(
         "tick: sats=%d, emitted=%s, work=%.3fs, sleep=%.3fs",
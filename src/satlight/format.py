@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from operator import itemgetter
 from typing import List, Tuple
 
 """
@@ -14,8 +15,20 @@ Formatter (DP-1.2.1)
 # This function formats the pairs into a comma-separated one-liner.
 def format_line(pairs: List[Tuple[int, str]]) -> str:
     """Return a single command line without a trailing newline."""
-    if not pairs:
+    n = len(pairs)
+    if n == 0:
         return ""
-    # Sort by ID for stability
-    pairs_sorted = sorted(pairs, key=lambda t: t[0])
-    return ", ".join(f"{sid}: {color}" for sid, color in pairs_sorted)
+    # One or two satellites overhead is the usual tick: format directly, no sort check/join
+    if n == 1:
+        sid, color = pairs[0]
+        return f"{sid}: {color}"
+    if n == 2:
+        (a, ca), (b, cb) = pairs
+        return f"{a}: {ca}, {b}: {cb}" if a <= b else f"{b}: {cb}, {a}: {ca}"
+    # Sort by ID for stability (skipped when the input is already in ID order)
+    if all(pairs[i][0] <= pairs[i + 1][0] for i in range(len(pairs) - 1)):
+        pairs_sorted = pairs
+    else:
+        pairs_sorted = sorted(pairs, key=itemgetter(0))
+    # A list (not a generator) lets str.join size its buffer in one pass
+    return ", ".join([f"{sid}: {color}" for sid, color in pairs_sorted])
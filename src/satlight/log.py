@@ -3,6 +3,9 @@
 from __future__ import annotations
 import logging
 import sys
+from typing import Any
+
+_REPR_MAX = 200  # cap on how much of a malformed payload we render into a log line
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -15,3 +18,9 @@ def get_logger(name: str) -> logging.Logger:
         logger.setLevel(logging.INFO)
         logger.propagate = False
     return logger
+
+
+def short_repr(obj: Any) -> str:
+    """repr() of a (possibly large) payload for a log line, truncated to _REPR_MAX chars."""
+    r = repr(obj)
+    return r if len(r) <= _REPR_MAX else r[:_REPR_MAX] + "..."
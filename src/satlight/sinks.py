@@ -1,37 +1,165 @@
 from __future__ import annotations
 
+import atexit
+import io
+import os
+import select
 import socket
 import sys
-from typing import Final
+from typing import IO, Dict, Final, Optional, Tuple
 
 """
 Sinks (C-6):
   - stdout_sink(line)
-  - file_sink(path, line)
-  - tcp_sink(host, port, line)
+  - file_sink(path, line)  (append handle kept open per path, reopened if the file is replaced)
+  - tcp_sink(host, port, data)  (data: newline-terminated UTF-8 bytes; persistent connection per (host, port), reconnects on failure)
+  - flush_sinks()  (stdout/file writes are buffered; the emitter flushes once per tick)
 No logging here; emitter handles error isolation/logging (C-5).
 """
 
 # This is the newline character.
 _NEWLINE: Final[str] = "\n"
 
+# Open append-mode file handles, one per path; reused across ticks instead of open-per-line.
+_FILE_POOL: Dict[str, IO[str]] = {}
+
+# Open TCP connections, one per (host, port); reused across ticks instead of connect-per-line.
+_TCP_POOL: Dict[Tuple[str, int], socket.socket] = {}
+
 
 # This function writes the line to the standard output.
 def stdout_sink(line: str) -> None:
-    sys.stdout.write(line + _NEWLINE)
-    sys.stdout.flush()
+    sys.stdout.write(line + _NEWLINE)  # flushed by flush_sinks() at the end of the tick
+
+
+# This function switches a non-TTY stdout to block buffering (flush_sinks() flushes per tick).
+def use_block_buffered_stdout() -> None:
+    if isinstance(sys.stdout, io.TextIOWrapper) and not sys.stdout.isatty():
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
+
+# This function checks whether a pooled handle still refers to the file currently at path.
+def _file_is_current(path: str, f: IO[str]) -> bool:
+    try:
+        st_path = os.stat(path)
+    except OSError:
+        return False  # removed (e.g. rotated away or cleaned up)
+    st_open = os.fstat(f.fileno())
+    return (st_path.st_dev, st_path.st_ino) == (st_open.st_dev, st_open.st_ino)
+
+
+# This function closes and forgets the pooled handle for path, if any.
+def _file_drop(path: str) -> None:
+    f = _FILE_POOL.pop(path, None)
+    if f is not None:
+        try:
+            f.close()
+        except OSError:
+            pass
 
 
 # This function writes the line to the file.
 def file_sink(path: str, line: str) -> None:
-    # Append mode; create file if it doesn't exist
-    with open(path, "a", encoding="utf-8") as f:
+    # Append mode; create file if it doesn't exist. Buffered; flushed by flush_sinks().
+    f = _FILE_POOL.get(path)
+    if f is not None:
+        if _file_is_current(path, f):
+            try:
+                f.write(line + _NEWLINE)
+                return
+            except OSError:
+                pass
+        _file_drop(path)  # replaced/broken: reopen once below
+
+    f = open(path, "a", encoding="utf-8")
+    try:
         f.write(line + _NEWLINE)
-        f.flush()
+    except OSError:
+        f.close()
+        raise
+    _FILE_POOL[path] = f
+
+
+# This function flushes buffered stdout and file output (one flush per destination per tick).
+def flush_sinks() -> None:
+    """Flush every destination; a failing file handle is dropped (reopened next write)."""
+    first_error: Optional[OSError] = None
+    sys.stdout.flush()
+    for path, f in list(_FILE_POOL.items()):
+        try:
+            f.flush()
+        except OSError as e:
+            _file_drop(path)
+            first_error = first_error or e
+    if first_error is not None:
+        raise first_error
+
+
+# This function closes all pooled file handles (registered to run at interpreter exit).
+def close_files() -> None:
+    for path in list(_FILE_POOL):
+        _file_drop(path)
+
+
+# This function opens a TCP connection tuned for small, prompt, long-lived writes.
+def _tcp_connect(host: str, port: int, timeout: float) -> socket.socket:
+    sock = socket.create_connection((host, port), timeout=timeout)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+# This function checks (without blocking) whether the peer has closed a pooled connection.
+def _tcp_is_stale(sock: socket.socket) -> bool:
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        if not readable:
+            return False  # nothing pending: connection still open
+        return sock.recv(1, socket.MSG_PEEK) == b""  # b"" means the peer sent FIN
+    except OSError:
+        return True
+
+
+# This function closes and forgets the pooled connection for (host, port), if any.
+def _tcp_drop(key: Tuple[str, int]) -> None:
+    sock = _TCP_POOL.pop(key, None)
+    if sock is not None:
+        try:
+            sock.close()
+        except OSError:
+            pass
 
 
 # This function writes the line to the TCP.
-def tcp_sink(host: str, port: int, line: str, *, timeout: float = 3.0) -> None:
-    with socket.create_connection((host, port), timeout=timeout) as sock:
-        data = (line + _NEWLINE).encode("utf-8")
+def tcp_sink(host: str, port: int, data: bytes, *, timeout: float = 3.0) -> None:
+    """Send one already-encoded line (the emitter encodes once per tick for all TCP sinks)."""
+    key = (host, port)
+
+    # Reuse the pooled connection when it is still healthy.
+    sock = _TCP_POOL.get(key)
+    if sock is not None:
+        if not _tcp_is_stale(sock):
+            try:
+                sock.sendall(data)
+                return
+            except OSError:  # BrokenPipeError, ConnectionResetError, timeout, ...
+                pass
+        _tcp_drop(key)  # stale/broken: reconnect once below
+
+    sock = _tcp_connect(host, port, timeout)
+    try:
         sock.sendall(data)
+    except OSError:
+        sock.close()
+        raise
+    _TCP_POOL[key] = sock
+
+
+# This function closes all pooled TCP connections (registered to run at interpreter exit).
+def close_tcp_connections() -> None:
+    for key in list(_TCP_POOL):
+        _tcp_drop(key)
+
+
+atexit.register(close_files)
+atexit.register(close_tcp_connections)
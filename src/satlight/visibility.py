@@ -1,19 +1,35 @@
 from __future__ import annotations
 
+import bisect
+import heapq
+import logging
+import math
+import os
 import time
-import random
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass
 
-from .config import AppConfig
-from .api import fetch_next_pass
-from .log import get_logger
+import orjson
+
+from .config import ConfigLike
+from .api import FetchResult, RetryAfter, fetch_next_pass, submit_fetch
+from .log import get_logger, short_repr
 
 """
 Visibility decision
 - DP-1.1.2.2: Filter by time window (rise..set) AND min_elevation_deg using linear interpolation
 - DP-1.1.2.3: Collect (id, color) pairs from configured satellites
 
+Optionally (cfg.cache_file) the cached passes are saved to disk after a tick that stored a
+new one and loaded at startup, so a restart does not refetch every still-valid pass.
+
+Fetches run in the background on the API client's shared pool (api.submit_fetch). A tick
+waits at most fetch_wait_sec (default _FETCH_WAIT_SEC) for the fetches it started; anything
+slower is installed into the cache at the start of a later tick, so network latency never
+stretches the cadence. A single-shot run (fetch_wait_sec=None) waits for its fetches instead.
+All cache updates happen on the tick thread: worker threads only complete their Futures.
+
 Maps to:
   FR-1.1.2.*, CN-1.1, CN-1.2
 """
@@ -22,258 +38,577 @@ Maps to:
 _LOG = get_logger(__name__)
 
 
+# Numeric pass fields, parsed once when a pass is cached (timestamps in s, altitudes in deg).
+class _PassFields(NamedTuple):
+    tr: int  # rise utc_timestamp
+    tc: int  # culmination utc_timestamp
+    ts: int  # set utc_timestamp
+    ar: float  # rise alt
+    ac: float  # culmination (peak) alt
+    aS: float  # set alt
+
+
 #
 # Simple in-memory cache: one entry per satellite.
-# We cache the latest pass object until its "set" time. If fetch fails,
+# We cache the latest pass until its "set" time. If fetch fails,
 # we set a retry_after time to avoid hammering the API (helps with 429s).
+# Only the six numbers the window math needs are kept, not the raw nested pass dict: a
+# pass whose numbers don't parse can never be overhead, so nothing downstream reads it.
+# slots=True: no per-instance __dict__ (smaller entries, faster attribute reads per tick).
 #
-@dataclass
+@dataclass(slots=True)
 class _CacheEntry:
-    pass_obj: Optional[Dict[str, Any]]  # raw pass object (None if none cached yet)
     set_ts: int  # cached pass 'set' timestamp (0 if unknown)
     retry_after: float = 0.0  # monotonic time; don't refetch before this
     fail_streak: int = 0  # consecutive failures for exponential backoff
+    fields: Optional[_PassFields] = None  # parsed pass numbers (None if none/unparseable)
+    # Threshold window of fields, memoized for window_elev (None = not computed yet). The
+    # empty window (0, -1) means "never qualifies": no fields, or peak below min_elev.
+    t_enter: int = 0
+    t_exit: int = -1
+    window_elev: Optional[float] = None
 
 
 _CACHE: Dict[int, _CacheEntry] = {}
 _RR_IDX: int = 0  # round-robin start index across ticks
+_DIRTY: bool = False  # a pass was stored since the last save_cache()
+# Ids whose cached pass is parsed and not yet set: the only rows the per-tick filter needs to
+# look at. Updated on events only (fetch stored, load, expiry seen in visible_now's pass 1).
+_ELIGIBLE: Set[int] = set()
+# (set_ts, sat_id) of eligible passes, kept sorted: one bisect per tick finds every pass that
+# has set since, instead of comparing each satellite's set time. Entries of replaced passes
+# are left behind and ignored when reached (set_ts no longer matches the cache row).
+_EXPIRY: List[Tuple[int, int]] = []
+
+# Event schedule for the filter: a min-heap of (utc_ts, sat_id) "re-evaluate sat_id at ts"
+# events (window enter, window exit + 1), and the set of ids currently inside their window.
+# Each tick pops only the events that came due, so satellites between passes cost nothing.
+# Events are never removed when a pass is replaced: a stale one just re-evaluates its id.
+# The schedule is for one min_elev and a forward-moving clock; either changing rebuilds it.
+# next_state_change_ts reads the next window edge from the top of the same heap.
+_EVENTS: List[Tuple[int, int]] = []
+_ACTIVE: Set[int] = set()
+_PENDING: Set[int] = set()  # ids whose eligibility changed since the last tick (to schedule)
+_SCHED_ELEV: Optional[float] = None  # min_elev the schedule was built for
+_SCHED_NOW: int = -1  # now_utc of the last tick that used the schedule
+
+# Background fetches: at most one in flight per satellite. Each tick installs the finished
+# ones itself (Future.done() sweep), so worker threads never touch the cache structures.
+_FETCH_WAIT_SEC = 2.0  # default longest wait of a tick for the fetches it just started
+_INFLIGHT: Dict[int, Future[FetchResult]] = {}
+
+
+#
+# Token bucket admission for API calls: a burst of up to `capacity` fetches, refilled at
+# `rate` per second (monotonic clock). A refused fetch is simply retried on a later tick.
+#
+@dataclass(slots=True)
+class _TokenBucket:
+    rate: float  # tokens added per second
+    capacity: float  # maximum burst
+    tokens: float = -1.0  # current tokens (< 0: not used yet, starts full)
+    stamp: float = 0.0  # monotonic time of the last refill
+
+    # This function takes one token if available, refilling for the time elapsed since the last call.
+    def try_acquire(self, now: float) -> bool:
+        if self.tokens < 0.0:
+            self.tokens = self.capacity
+        else:
+            # max(0, ...): a clock that steps backwards (tests) never drains the bucket.
+            self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+_BUCKET = _TokenBucket(rate=1.0, capacity=5.0)
 
 
 def clear_cache_for_tests() -> None:  # exported for unit tests
     _CACHE.clear()
-    global _RR_IDX
+    _ELIGIBLE.clear()
+    _EXPIRY.clear()
+    global _RR_IDX, _DIRTY, _SCHED_ELEV
     _RR_IDX = 0
+    _DIRTY = False
+    _EVENTS.clear()
+    _ACTIVE.clear()
+    _PENDING.clear()
+    _SCHED_ELEV = None
+    _BUCKET.tokens = -1.0
+    _INFLIGHT.clear()  # results still in flight from an earlier test are then dropped
 
 
-# This function parses the altitude from the pass object.
-def _parse_alt(value: Any) -> Optional[float]:
-    try:
-        if isinstance(value, (int, float)):
-            return float(value)
-        if isinstance(value, str):
-            return float(value.strip())
-    except (TypeError, ValueError):
-        return None
-    return None
+# This function forgets one satellite's cached pass, so the next tick fetches it again (tests).
+def pop_cache_entry_for_tests(sat_id: int) -> bool:  # exported for unit tests
+    """
+    Drop sat_id from the cache and the per-satellite indexes; True if it had a cache row.
+    O(1): its leftover _EXPIRY/_EVENTS entries are stale and ignored when reached. An
+    in-flight fetch for it is dropped too (its result is never installed).
+    """
+    _ELIGIBLE.discard(sat_id)
+    _ACTIVE.discard(sat_id)
+    _PENDING.discard(sat_id)
+    _INFLIGHT.pop(sat_id, None)
+    return _CACHE.pop(sat_id, None) is not None
 
 
+# This function extracts just the set time (fallback for passes whose other fields are malformed).
 def _extract_set_ts(pass_obj: Dict[str, Any]) -> Optional[int]:
     try:
         set_ts = int(pass_obj["set"]["utc_timestamp"])
         return set_ts
-    except Exception:
-        return None
-
-
-# This function converts a value to an integer.
-def _safe_int(v: Any) -> Optional[int]:
-    try:
-        return int(v)
-    except Exception:
+    except (KeyError, TypeError, ValueError):
         return None
 
 
-# This function clamps (limits) a value between a minimum and maximum. This is used to ensure that the value is within the range of min_elevation_deg to 90 degrees.
-def _clamp(x: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, x))
+# This function checks the three altitudes are finite (timestamps already overflow int() if not).
+def _finite_alts(fields: _PassFields) -> bool:
+    return math.isfinite(fields.ar) and math.isfinite(fields.ac) and math.isfinite(fields.aS)
 
 
-# This function calculates the time when a line crosses a certain altitude using linear interpolation.
-def _cross_time(t1: int, a1: float, t2: int, a2: float, m: float) -> Optional[int]:
+# This function parses the numeric rise/culmination/set fields of a pass object.
+def _parse_pass_fields(pass_obj: Dict[str, Any]) -> Optional[_PassFields]:
     """
-    Return the timestamp (int) when a line between (t1,a1) -> (t2,a2) crosses altitude m.
-    If the segment is flat:
-      - if a1 >= m: crossing occurs at t1 (we're already above m)
-      - else: no crossing on this segment
-    If the crossing fraction is outside [0,1], return None (no crossing on this segment).
+    Return the six numbers the window math needs, or None if any is missing/unparseable.
+    Each field is read and converted exactly once inside a single try; int()/float() accept
+    the API's int/float/numeric-string values directly, and anything else raises. A
+    non-finite timestamp overflows int(); a non-finite altitude ("nan", "inf") is rejected
+    explicitly, since float() accepts it.
     """
-    if a1 == a2:
-        return t1 if a1 >= m else None
-    f = (m - a1) / (a2 - a1)
-    if f < 0.0 or f > 1.0:
+    try:
+        rise = pass_obj["rise"]
+        culm = pass_obj["culmination"]
+        setp = pass_obj["set"]
+        fields = _PassFields(
+            int(rise["utc_timestamp"]),
+            int(culm["utc_timestamp"]),
+            int(setp["utc_timestamp"]),
+            float(rise["alt"]),
+            float(culm["alt"]),
+            float(setp["alt"]),
+        )
+        if not _finite_alts(fields):
+            raise ValueError("non-finite altitude")  # float() accepts "nan" / "inf"
+    except (KeyError, TypeError, ValueError, OverflowError):
+        # Missing key, a part that is not a mapping, or a non-numeric / non-finite value.
+        if _LOG.isEnabledFor(logging.DEBUG):  # skip the repr() entirely unless it will be shown
+            _LOG.debug("malformed pass object: %s", short_repr(pass_obj))
         return None
-    # Use nearest-int; timestamps are seconds and our 10 s cadence makes ±1 s irrelevant.
-    return int(round(t1 + f * (t2 - t1)))
+    return fields
 
 
-# This function calculates the time window during which the altitude is greater than or equal to the minimum elevation using linear interpolation.
-def _compute_threshold_window(
-    pass_obj: Dict[str, Any], min_elev: float
-) -> Optional[Tuple[int, int]]:
+# This function is the numeric window kernel: plain int/float arguments in, fixed-shape tuple out.
+def _window_kernel(
+    tr: int, tc: int, ts: int, ar: float, ac: float, aS: float, min_elev: float
+) -> Tuple[int, int, bool]:
     """
-    Compute the inclusive window [t_enter, t_exit] during which altitude >= min_elev,
+    Return (t_enter, t_exit, ok) for the inclusive window during which altitude >= min_elev,
     using linear interpolation between rise->culmination and culmination->set.
-    Returns None if the pass never reaches min_elev.
+    ok is False (and the times are 0) if the pass never reaches min_elev.
     """
-    try:
-        rise = pass_obj["rise"]
-        culm = pass_obj["culmination"]
-        setp = pass_obj["set"]
+    # If the peak never reaches min_elev, the pass never qualifies.
+    if ac < min_elev:
+        return (0, 0, False)
+
+    # Closed form: the fraction of each segment spent below min_elev. With ac >= min_elev
+    # both fractions already lie in [0, 1] and neither denominator can be zero, so no
+    # per-segment crossing check (or helper call) is needed.
+    # Ascending (rise -> culmination): 0 when already above threshold at rise.
+    f_enter = 0.0 if ar >= min_elev else (min_elev - ar) / (ac - ar)
+    # Descending (culmination -> set): 1 when we stay above threshold until set.
+    f_exit = 1.0 if aS >= min_elev else (ac - min_elev) / (ac - aS)
 
-        tr = _safe_int(rise.get("utc_timestamp"))
-        tc = _safe_int(culm.get("utc_timestamp"))
-        ts = _safe_int(setp.get("utc_timestamp"))
-        if tr is None or tc is None or ts is None:
-            return None
-
-        ar = _parse_alt(rise.get("alt"))
-        ac = _parse_alt(culm.get("alt"))
-        aS = _parse_alt(setp.get("alt"))
-        if ar is None or ac is None or aS is None:
-            return None
-
-        # If the peak never reaches min_elev, the pass never qualifies.
-        if ac < min_elev:
-            return None
-
-        # Ascending (rise -> culmination): when do we first cross up through min_elev?
-        if ar >= min_elev:
-            t_enter = tr  # already above threshold at rise
-        else:
-            t_enter_result = _cross_time(tr, ar, tc, ac, min_elev)
-            if t_enter_result is None:
-                return None  # couldn't cross up (shouldn't happen if ac >= min_elev)
-            t_enter = t_enter_result
-
-        # Descending (culmination -> set): when do we fall back below min_elev?
-        if aS >= min_elev:
-            t_exit = ts  # stay above threshold until set
-        else:
-            t_exit_result = _cross_time(tc, ac, ts, aS, min_elev)
-            if t_exit_result is None:
-                t_exit = ts  # conservative: treat remainder until set as above
-            else:
-                t_exit = t_exit_result
-
-        return (t_enter, t_exit)
-    except Exception:
-        return None
+    # Use nearest-int; timestamps are seconds and our 10 s cadence makes ±1 s irrelevant.
+    return (int(round(tr + f_enter * (tc - tr))), int(round(tc + f_exit * (ts - tc))), True)
+
+
+# Optional JIT for the kernel: opt-in with SATLIGHT_JIT=1 when numba is installed (it is not a
+# dependency). The window is computed once per fetched pass, so for a handful of satellites the
+# plain function is faster than paying numba's import and first-call compile; the opt-in is for
+# large satellite lists. cache=True keeps the compiled kernel on disk across restarts.
+if os.environ.get("SATLIGHT_JIT") == "1":
+    try:
+        from numba import njit
+    except ImportError:
+        _LOG.warning("SATLIGHT_JIT=1 but numba is not installed; using the Python window kernel")
+    else:
+        _window_kernel = njit(cache=True)(_window_kernel)
 
 
-# This function checks if the satellite is overhead now by checking if the time window is within the current time.
-def _is_overhead_now(pass_obj: Dict[str, Any], now_utc: int, min_elev: float) -> bool:
+# This function returns a cache entry's threshold window, computing it once per pass and min_elev.
+def _entry_window(entry: _CacheEntry, min_elev: float) -> Tuple[int, int]:
     """
     Interpolation rule (DP-1.1.2.2, refined):
       Compute [t_enter, t_exit] where the pass is at/above min_elev via linear interpolation
       between (rise->culmination) and (culmination->set). Consider 'overhead now' iff
       t_enter <= now_utc <= t_exit (inclusive).
+    The window is stored on the entry tagged with min_elev, so it is recomputed only when the
+    pass is replaced (tag reset) or a different threshold is asked for. The window always
+    lies inside [rise, set], so an expired pass never contains now.
     """
-    window = _compute_threshold_window(pass_obj, min_elev)
-    if window is None:
-        return False
-    t_enter, t_exit = window
-    return t_enter <= now_utc <= t_exit
-
-
-# This function gets the pass object with cache.
-def _get_pass_with_cache(
+    if entry.window_elev != min_elev:
+        f = entry.fields
+        try:
+            t_enter, t_exit, ok = _window_kernel(*f, min_elev) if f is not None else (0, 0, False)
+        except (ValueError, OverflowError):
+            # round() of a nan/inf time: a non-finite altitude never qualifies (and the empty
+            # window is memoized, so later ticks do not recompute it).
+            t_enter, t_exit, ok = 0, 0, False
+        entry.t_enter, entry.t_exit = (t_enter, t_exit) if ok else (0, -1)
+        entry.window_elev = min_elev
+    return entry.t_enter, entry.t_exit
+
+
+# This function records whether sat_id's cached pass is eligible, queueing it for (re)scheduling.
+def _set_eligible(sat_id: int, ok: bool) -> None:
+    if ok:
+        _ELIGIBLE.add(sat_id)
+        bisect.insort(_EXPIRY, (_CACHE[sat_id].set_ts, sat_id))
+    else:
+        _ELIGIBLE.discard(sat_id)
+    _PENDING.add(sat_id)
+
+
+# This function re-evaluates whether sat_id is inside its window at now_utc (optionally pushing its future events).
+def _schedule(sat_id: int, now_utc: int, min_elev: float, *, push: bool = True) -> None:
+    entry = _CACHE.get(sat_id)
+    if entry is None or sat_id not in _ELIGIBLE:
+        _ACTIVE.discard(sat_id)
+        return
+    t_enter, t_exit = _entry_window(entry, min_elev)
+    if t_enter <= now_utc <= t_exit:
+        _ACTIVE.add(sat_id)
+    else:
+        _ACTIVE.discard(sat_id)
+    if push:
+        for ts in (t_enter, t_exit + 1):  # an empty (0, -1) window pushes nothing
+            if ts > now_utc:
+                heapq.heappush(_EVENTS, (ts, sat_id))
+
+
+# This function records a fetch result in the cache (success, bad shape, or failure + backoff).
+def _store_fetch_result(
     sat_id: int,
-    cfg: AppConfig,
-    now_utc: int,
+    pass_obj: FetchResult,
     *,
-    fetcher: Callable[[int, float, float], Optional[Dict[str, Any]]],
     mono: Callable[[], float],
-) -> Optional[Dict[str, Any]]:
+) -> Optional[_PassFields]:
     """
-    Return a pass_obj using cache when possible; otherwise fetch and cache.
-    - Reuse cached pass until its set time.
-    - After a failed fetch, back off for ~60 s before trying again.
+    Update the cache entry for sat_id from a fetch result and return its parsed fields.
+    - RetryAfter => back off for exactly the server-requested time (capped at 3600 s).
+    - None => exponential backoff with jitter before the next attempt.
+    - Pass without a usable set time => not cached long-term (and never overhead).
+    - Otherwise cache until its set time and clear backoff.
     """
     entry = _CACHE.get(sat_id)
-    if entry:
-        # If we have a valid pass and we're still before its set time, reuse it.
-        if now_utc <= entry.set_ts:
-            return entry.pass_obj
-        # If we're before retry_after (monotonic clock), skip calling the API now.
-        if mono() < entry.retry_after:
-            return None
-
-    # Either no cache, expired pass, or backoff elapsed: try to fetch
-    pass_obj = fetcher(sat_id, cfg.lat, cfg.lon)
-    if pass_obj is None:
-        # Exponential backoff with jitter: base 60s, cap at 3600s
-        base = 60.0
+    if pass_obj is None or isinstance(pass_obj, RetryAfter):
         streak = (entry.fail_streak + 1) if entry else 1
-        delay = min(3600.0, base * (2 ** (streak - 1)))
-        jitter = delay * 0.1 * (2 * random.random() - 1.0)  # ±10%
-        backoff_until = mono() + max(1.0, delay + jitter)
-        new_entry = entry or _CacheEntry(pass_obj=None, set_ts=0)
+        if pass_obj is not None:
+            # The server told us when to come back: no guessing, no jitter needed.
+            backoff_until = mono() + max(1.0, min(3600.0, pass_obj.seconds))
+        else:
+            # Exponential backoff with jitter: base 60s, cap at 3600s
+            base = 60.0
+            delay = min(3600.0, base * (2 ** (streak - 1)))
+            # ±10% jitter derived from (sat_id, streak): no shared RNG state or lock, and
+            # satellites failing together still spread their retries apart.
+            jitter = delay * 0.1 * ((hash((sat_id, streak)) & 0xFFFF) / 32768.0 - 1.0)
+            backoff_until = mono() + max(1.0, delay + jitter)
+        new_entry = entry or _CacheEntry(set_ts=0)
         new_entry.retry_after = backoff_until
         new_entry.fail_streak = streak
         _CACHE[sat_id] = new_entry
+        _set_eligible(sat_id, False)
         return None
 
-    set_ts = _extract_set_ts(pass_obj)
+    # One walk over the pass: the six numbers (set time included) are parsed together, and
+    # only a malformed pass is walked again, to salvage its set time on its own.
+    fields = _parse_pass_fields(pass_obj)
+    set_ts = fields.ts if fields is not None else _extract_set_ts(pass_obj)
     if set_ts is None:
         # Bad pass shape; don't cache long-term
-        # Reset failure streak on "success" but no set time; still return pass.
-        new_entry = entry or _CacheEntry(pass_obj=None, set_ts=0)
-        new_entry.pass_obj = pass_obj
+        # Reset failure streak on "success" but no set time.
+        new_entry = entry or _CacheEntry(set_ts=0)
         new_entry.set_ts = 0
         new_entry.retry_after = 0.0
         new_entry.fail_streak = 0
+        new_entry.fields = None
+        new_entry.window_elev = None
         _CACHE[sat_id] = new_entry
-        return pass_obj
+        _set_eligible(sat_id, False)
+        return None
+
+    # Success: cache until set time (with its numbers parsed once); clear backoff. The new
+    # entry's window is computed on first use (window_elev None).
+    _CACHE[sat_id] = _CacheEntry(set_ts=set_ts, retry_after=0.0, fail_streak=0, fields=fields)
+    if fields is not None:
+        global _DIRTY
+        _DIRTY = True
+    _set_eligible(sat_id, fields is not None)
+    return fields
+
 
-    # Success: cache until set time; clear backoff.
-    _CACHE[sat_id] = _CacheEntry(pass_obj=pass_obj, set_ts=set_ts, retry_after=0.0, fail_streak=0)
-    return pass_obj
+# This function installs a finished background fetch into the cache.
+def _install_fetch(sat_id: int, fut: Future[FetchResult], *, mono: Callable[[], float]) -> None:
+    del _INFLIGHT[sat_id]
+    try:
+        result = fut.result()
+    except Exception as e:  # a fetcher bug counts as a failed fetch; never crash the tick
+        _LOG.error("fetch failed (id=%s): %s", sat_id, e)
+        result = None
+    _store_fetch_result(sat_id, result, mono=mono)
+
+
+# This function saves the still-valid cached passes to path (only if one was stored since).
+def save_cache(path: str, now_utc: int) -> None:
+    """
+    Write {sat_id: [tr, tc, ts, ar, ac, aS]} for passes not yet set, atomically (temp file +
+    os.replace), so a crash mid-write never leaves a truncated cache. Backoff state is not
+    saved: it is on the monotonic clock, which does not survive a restart.
+    Errors are logged (C-5), never raised: persistence is an optimization only.
+    """
+    global _DIRTY
+    if not _DIRTY:
+        return
+    rows = {
+        str(sat_id): list(entry.fields)
+        for sat_id, entry in _CACHE.items()
+        if entry.fields is not None and now_utc <= entry.set_ts
+    }
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(rows))
+        os.replace(tmp, path)
+    except OSError as e:
+        _LOG.warning("could not save pass cache to %s: %s", path, e)
+        try:
+            os.unlink(tmp)  # don't leave a partial temp file behind
+        except OSError:
+            pass  # never created (or already gone)
+    # Cleared on failure too: a path that keeps failing is retried (and warned about) only once
+    # a new pass is stored, not on every tick.
+    _DIRTY = False
+
+
+# This function loads passes saved by save_cache, skipping any that have already set.
+def load_cache(path: str, now_utc: int) -> int:
+    """
+    Fill the cache from path; returns how many passes were loaded (0 if none/unreadable).
+    Rows are checked one by one: a malformed row (bad id, wrong length, non-numeric or
+    non-finite value) is skipped and counted in a single warning, and the others still load.
+    """
+    try:
+        with open(path, "rb") as f:
+            rows = orjson.loads(f.read())
+    except FileNotFoundError:
+        return 0
+    except (OSError, orjson.JSONDecodeError) as e:
+        _LOG.warning("ignoring unreadable pass cache %s: %s", path, e)
+        return 0
+    if not isinstance(rows, dict):
+        _LOG.warning("ignoring malformed pass cache %s: not a mapping", path)
+        return 0
+
+    loaded = 0
+    skipped = 0
+    for key, row in rows.items():
+        try:
+            sat_id = int(key)
+            tr, tc, ts, ar, ac, aS = row
+            fields = _PassFields(int(tr), int(tc), int(ts), float(ar), float(ac), float(aS))
+            if not _finite_alts(fields):
+                raise ValueError("non-finite altitude")
+        except (TypeError, ValueError, OverflowError):
+            skipped += 1
+            continue
+        if now_utc > fields.ts:
+            continue  # already set; refetch as usual
+        _CACHE[sat_id] = _CacheEntry(set_ts=fields.ts, fields=fields)
+        _set_eligible(sat_id, True)
+        loaded += 1
+    if skipped:
+        _LOG.warning("skipped %d malformed row(s) in pass cache %s", skipped, path)
+    return loaded
+
+
+# This function brings the event schedule up to now_utc (rebuilding it for a new threshold).
+def _advance_schedule(now_utc: int, min_elev: float) -> None:
+    """
+    Schedule rows whose eligibility changed, then pop the window enter/exit events that came
+    due, so _ACTIVE holds the ids inside their window at now_utc. O(k log N) for the k
+    satellites changing state, not a scan of every configured satellite.
+    """
+    global _SCHED_ELEV, _SCHED_NOW
+    if min_elev != _SCHED_ELEV or now_utc < _SCHED_NOW:
+        # New threshold, or the clock stepped backwards: rebuild from the eligible rows.
+        _EVENTS.clear()
+        _ACTIVE.clear()
+        _PENDING.update(_ELIGIBLE)
+        _SCHED_ELEV = min_elev
+    _SCHED_NOW = now_utc
+    if _PENDING:
+        for sat_id in _PENDING:
+            _schedule(sat_id, now_utc, min_elev)
+        _PENDING.clear()
+    events = _EVENTS
+    while events and events[0][0] <= now_utc:
+        _schedule(heapq.heappop(events)[1], now_utc, min_elev, push=False)
+
+
+# This function returns the next time a cached satellite's visibility (or cache validity) changes.
+def next_state_change_ts(now_utc: int, min_elev: float) -> Optional[int]:
+    """
+    Earliest UTC second after now_utc at which a cached pass enters its threshold window,
+    leaves it (t_exit + 1), or expires (set + 1, when a refetch becomes due).
+    Returns None if no cached pass has such an event ahead.
+    Read from the event schedule (brought up to now_utc first) and the sorted expiry list,
+    so only events that came due or went stale are touched, not every cached pass.
+    """
+    _advance_schedule(now_utc, min_elev)
+    events = _EVENTS
+    # Discard stale events at the top (their id is no longer eligible, or its pass was replaced
+    # and the event is not one of its window edges); re-evaluating them would change nothing.
+    while events:
+        ts, sat_id = events[0]
+        entry = _CACHE.get(sat_id)
+        if sat_id in _ELIGIBLE and entry is not None:
+            t_enter, t_exit = _entry_window(entry, min_elev)
+            if ts == t_enter or ts == t_exit + 1:
+                break
+        heapq.heappop(events)
+    best = events[0][0] if events else None
+
+    # First live expiry still ahead (set_ts >= now_utc, i.e. set + 1 > now_utc).
+    expiry = _EXPIRY
+    for i in range(bisect.bisect_left(expiry, (now_utc, -1)), len(expiry)):
+        set_ts, sat_id = expiry[i]
+        entry = _CACHE.get(sat_id)
+        if sat_id in _ELIGIBLE and entry is not None and entry.set_ts == set_ts:
+            return set_ts + 1 if best is None else min(best, set_ts + 1)
+    return best
 
 
 # This function checks if the satellite is visible now.
 def visible_now(
-    cfg: AppConfig,
+    cfg: ConfigLike,
     *,
-    fetcher: Callable[[int, float, float], Optional[Dict[str, Any]]] = fetch_next_pass,
+    fetcher: Callable[[int, float, float], FetchResult] = fetch_next_pass,
     now_fn: Callable[[], float] = time.time,
     mono_fn: Callable[[], float] = time.monotonic,
     max_fetches_per_tick: Optional[int] = None,
+    sat_items: Optional[Sequence[Tuple[int, str]]] = None,
+    window_provider: Optional[Callable[[ConfigLike, int], Tuple[int, int]]] = None,
+    fetch_wait_sec: Optional[float] = _FETCH_WAIT_SEC,
 ) -> List[Tuple[int, str]]:
     """
-    Return list of (sat_id, color) for satellites considered 'overhead now'
-    under the documented rule (DP-1.1.2.2) using pass predictions.
+    Return list of (sat_id, color), in ascending id order, for satellites considered
+    'overhead now' under the documented rule (DP-1.1.2.2) using pass predictions.
 
-    - Calls fetcher(id, cfg.lat, cfg.lon) per configured id.
+    - Calls fetcher(id, cfg.lat, cfg.lon) in the background for each id needing a refresh;
+      results slower than fetch_wait_sec are used from a later tick. fetch_wait_sec=None
+      waits for every fetch this tick started (single-shot runs, where there is no later tick).
     - Uses now_utc = int(now_fn()) for deterministic testing.
+    - sat_items: optional precomputed (id, color) snapshot of cfg.satellites (the config is
+      fixed for the run, so long-running callers build it once instead of every tick).
+    - window_provider: optional window_provider(cfg, id) -> (t_enter, t_exit) giving each
+      satellite's threshold window directly (tests). It bypasses fetching, the cache and
+      the interpolation; the inclusive t_enter <= now <= t_exit decision is the same.
     """
     now_utc = int(now_fn())
-    results: List[Tuple[int, str]] = []
 
     # Determine round-robin order so we don't hammer the API for all sats at once.
-    sat_items = list(cfg.satellites.items())
-    n = len(sat_items)
+    items = tuple(cfg.satellites.items()) if sat_items is None else sat_items
+    n = len(items)
     if n == 0:
-        return results
+        return []
+
+    if window_provider is not None:
+        inside = []
+        for pair in items:
+            t_enter, t_exit = window_provider(cfg, pair[0])
+            if t_enter <= now_utc <= t_exit:
+                inside.append(pair)
+        return sorted(inside)
 
     global _RR_IDX
     start = _RR_IDX % n
-    ordered = sat_items[start:] + sat_items[:start]
 
     # Determine the fetch budget for this tick.
     fetch_budget = max_fetches_per_tick if max_fetches_per_tick is not None else n
 
-    for sat_id, color in ordered:
-        # Try cache first; only fetch if we still have budget and cache is unusable.
-        entry = _CACHE.get(sat_id)
-        pass_obj: Optional[Dict[str, Any]] = None
+    # Local aliases for names used inside the per-satellite loops: LOAD_FAST instead of a
+    # module-dict lookup (LOAD_GLOBAL) on every iteration.
+    cache = _CACHE
+    eligible = _ELIGIBLE
+    mono_now = mono_fn()
+
+    # Install background fetches that finished since the last tick.
+    if _INFLIGHT:
+        for sat_id, fut in [(k, f) for k, f in _INFLIGHT.items() if f.done()]:
+            _install_fetch(sat_id, fut, mono=mono_fn)
+
+    # Expire passes that have set (set_ts < now): they are the sorted prefix before one bisect.
+    expiry = _EXPIRY
+    if expiry and expiry[0][0] < now_utc:
+        k = bisect.bisect_left(expiry, (now_utc, -1))
+        for set_ts, sat_id in expiry[:k]:
+            entry = cache.get(sat_id)
+            if sat_id in eligible and entry is not None and entry.set_ts == set_ts:
+                _set_eligible(sat_id, False)
+        del expiry[:k]
+
+    # Pass 1: pick the satellites to fetch (expired or uncached, bounded by the budget and
+    # admitted by the token bucket).
+    to_fetch: List[int] = []
+    # Rotation by index instead of slicing: range(start - n, start) visits items[start:] (as
+    # negative indices) and then items[:start], with no per-tick list or modulo.
+    for i in range(start - n, start):
+        sat_id = items[i][0]
+        if sat_id in eligible:
+            continue  # cache hit (not yet set, per the expiry step above)
+        if sat_id in _INFLIGHT:
+            continue  # a fetch is already running in the background
+        entry = cache.get(sat_id)
         if entry and now_utc <= entry.set_ts:
-            pass_obj = entry.pass_obj
-        elif mono_fn() < (entry.retry_after if entry else 0.0):
-            pass_obj = None  # in backoff
-        else:
-            if fetch_budget > 0:
-                pass_obj = _get_pass_with_cache(sat_id, cfg, now_utc, fetcher=fetcher, mono=mono_fn)
-                fetch_budget -= 1
-            else:
-                # No budget left this tick; skip fetching this satellite now.
-                pass_obj = None
-
-        if pass_obj is None:
-            continue
-        if _is_overhead_now(pass_obj, now_utc, cfg.min_elevation_deg):
-            results.append((sat_id, color))
+            continue  # cache hit on a pass whose numbers did not parse
+        if mono_now < (entry.retry_after if entry else 0.0):
+            continue  # in backoff
+        elif fetch_budget > 0 and _BUCKET.try_acquire(mono_now):
+            to_fetch.append(sat_id)
+            fetch_budget -= 1
+        # else: no budget/tokens left this tick; skip fetching this satellite now.
+
+    # Pass 2: start this tick's fetches in the background and wait (bounded) for them.
+    # Finished ones are installed now; the rest stay in _INFLIGHT for a later tick's sweep.
+    if to_fetch:
+        futures: List[Future[FetchResult]] = []
+        for sat_id in to_fetch:
+            fut = submit_fetch(sat_id, cfg.lat, cfg.lon, fetcher=fetcher)
+            _INFLIGHT[sat_id] = fut
+            futures.append(fut)
+        wait(futures, timeout=fetch_wait_sec)
+        for sat_id, fut in zip(to_fetch, futures):
+            if fut.done():
+                _install_fetch(sat_id, fut, mono=mono_fn)
+
+    # Pass 3: filter (DP-1.1.2.2) and collect pairs (DP-1.1.2.3) from the event schedule:
+    # bring it up to now (rows whose eligibility changed, events that came due), then read
+    # the ids currently inside their window.
+    _advance_schedule(now_utc, cfg.min_elevation_deg)
 
     # Advance round-robin pointer for the next tick
     _RR_IDX = (_RR_IDX + 1) % n
 
-    return results
+    # Pairs in ascending id order (the order format_line emits them in), built by one
+    # comprehension over the active set: no incremental appends, and no work at all for the
+    # usual tick where nothing is overhead. The pairs are the config's prebuilt tuples
+    # (interned colors), so no tuple is allocated per visible satellite. Ids missing from
+    # this config (tests share the cache across configs) are skipped.
+    if not _ACTIVE:
+        return []
+    pairs = cfg.pair_by_id
+    return [pairs[sat_id] for sat_id in sorted(_ACTIVE) if sat_id in pairs]
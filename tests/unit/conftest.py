@@ -0,0 +1,143 @@
+import importlib.util
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+import pytest
+
+from src.satlight.config import AppConfig
+
+# Without the visibility module, skip collecting the test modules that import it (directly or
+# through emit/cli) instead of aborting the whole run on their import errors; the fixtures
+# below import it lazily for the same reason.
+_HAVE_VISIBILITY = importlib.util.find_spec("src.satlight.visibility") is not None
+collect_ignore = (
+    []
+    if _HAVE_VISIBILITY
+    else [
+        "test_cli.py",
+        "test_dp_1_1_2_2_filter_and_collect.py",
+        "test_dp_1_2_2_emitter.py",
+        "test_visibility_interpolation.py",
+    ]
+)
+
+
+# This function stands in for time.sleep/time.monotonic during tests: reaching it means a code
+# path read the real clock instead of the injected fake.
+def _real_clock_forbidden(*_args, **_kwargs):
+    raise AssertionError("test touched the real clock; inject monotonic_fn/sleep_fn fakes")
+
+
+# This fixture forbids real sleeps and monotonic clock reads for the whole session, so every
+# test must inject deterministic monotonic_fn/sleep_fn fakes (no wall-clock floor, no flakes).
+# The clock defaults were bound at import time, so they are swapped out alongside the module.
+@pytest.fixture(scope="session", autouse=True)
+def _no_real_clock():
+    if not _HAVE_VISIBILITY:
+        yield
+        return
+    import src.satlight.emit as emit_mod
+    from src.satlight import visibility
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(time, "sleep", _real_clock_forbidden)
+        mp.setattr(time, "monotonic", _real_clock_forbidden)
+        for fn in (emit_mod.run_once, emit_mod.run_forever):
+            mp.setitem(fn.__kwdefaults__, "monotonic_fn", _real_clock_forbidden)
+            mp.setitem(fn.__kwdefaults__, "sleep_fn", _real_clock_forbidden)
+        mp.setitem(visibility.visible_now.__kwdefaults__, "mono_fn", _real_clock_forbidden)
+        yield
+
+
+# This fixture resets the visibility module's cache before every test, so no test depends on
+# which tests ran before it in the same (xdist worker) process.
+@pytest.fixture(autouse=True)
+def _fresh_visibility_cache():
+    if _HAVE_VISIBILITY:
+        from src.satlight.visibility import clear_cache_for_tests
+
+        clear_cache_for_tests()
+    yield
+
+
+# This function builds the emitter tests' configuration for the given outputs.
+def _emit_cfg(outputs: list[str]) -> AppConfig:
+    return AppConfig(
+        lat=37.8,
+        lon=-122.4,
+        satellites={25544: "blue", 48915: "pink"},
+        outputs=outputs,
+        min_elevation_deg=10.0,
+    )
+
+
+# Shared (module-scoped) configurations: run_once only reads its config, so one validated
+# instance per output shape serves every test. To vary one, re-validate rather than model_copy
+# (which skips the field validators): AppConfig(**{**cfg.model_dump(), "outputs": [...]}).
+@pytest.fixture(scope="module")
+def stdout_cfg() -> AppConfig:
+    return _emit_cfg(["stdout"])
+
+
+# The file path is never opened: the fanout test replaces file_sink with a recording fake.
+@pytest.fixture(scope="module")
+def fanout_cfg() -> AppConfig:
+    return _emit_cfg(["stdout", "file:/tmp/passes.log", "tcp:127.0.0.1:9000"])
+
+
+@pytest.fixture(scope="module")
+def stdout_file_cfg() -> AppConfig:
+    return _emit_cfg(["stdout", "file:/tmp/log.txt"])
+
+
+_FAKE_SINK_MAXLEN = 8  # recorders are bounded: a runaway emit loop cannot grow them unbounded
+
+
+# Recording stand-in for the sinks module, as seen by the emitter (emit's `_sinks` reference).
+class _FakeSinks:
+    def __init__(self) -> None:
+        n = _FAKE_SINK_MAXLEN
+        self.stdout: Deque[str] = deque(maxlen=n)  # lines written to stdout
+        self.written: Deque[Tuple[str, str]] = deque(maxlen=n)  # (path, line) per file write
+        self.sent: Deque[Tuple[str, int, bytes]] = deque(maxlen=n)  # (host, port, data) per send
+
+    # This function clears the recorded writes (between tests).
+    def reset(self) -> None:
+        self.stdout.clear()
+        self.written.clear()
+        self.sent.clear()
+
+    def stdout_sink(self, line: str) -> None:
+        self.stdout.append(line)
+
+    def file_sink(self, path: str, line: str) -> None:
+        self.written.append((path, line))
+
+    def tcp_sink(self, host: str, port: int, data: bytes, *, timeout: float = 3.0) -> None:
+        self.sent.append((host, port, data))
+
+    def flush_sinks(self) -> None:
+        return None
+
+    def use_block_buffered_stdout(self) -> None:
+        return None
+
+
+# This fixture builds the one _FakeSinks the session's emitter tests share (it patches nothing).
+@pytest.fixture(scope="session")
+def _session_fake_sinks() -> _FakeSinks:
+    return _FakeSinks()
+
+
+# This fixture swaps the emitter's sinks module for the shared fake, with empty recorders, for
+# one test only: emitter tests that do not request it see the real module. Only emit sees the
+# fake; test_sinks.py keeps exercising the real sinks module. A test that needs one sink to
+# misbehave patches that method on the fake (monkeypatch undoes it afterwards).
+@pytest.fixture
+def patched_sinks(monkeypatch, _session_fake_sinks: _FakeSinks) -> _FakeSinks:
+    import src.satlight.emit as emit_mod
+
+    _session_fake_sinks.reset()
+    monkeypatch.setattr(emit_mod, "_sinks", _session_fake_sinks)
+    return _session_fake_sinks
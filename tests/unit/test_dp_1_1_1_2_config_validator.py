@@ -1,7 +1,9 @@
 import pytest
 from pydantic import ValidationError
 
-from src.satlight.config import validate_config
+import dataclasses
+
+from src.satlight.config import FileSpec, StdoutSpec, TcpSpec, validate_config
 
 
 # This function creates a valid raw dictionary for testing.
@@ -37,6 +39,61 @@ def test_FR_1_1_1_2__rejects_disallowed_output_sinks():
     print("✅test_FR_1_1_1_2__rejects_disallowed_output_sinks passed")
 
 
+# This test checks if the validate_config function parses outputs once into typed sink specs.
+def test_FR_1_1_1_2__parses_outputs_into_typed_sink_specs():
+    cfg = validate_config(_valid_raw())
+    assert cfg.parsed_outputs == [
+        StdoutSpec(),
+        FileSpec("/tmp/passes.log"),
+        TcpSpec("127.0.0.1", 9000),
+    ]
+    assert [str(spec) for spec in cfg.parsed_outputs] == cfg.outputs
+    print("✅test_FR_1_1_1_2__parses_outputs_into_typed_sink_specs passed")
+
+
+# This test checks if the validate_config function drops duplicate outputs (first occurrence kept).
+def test_FR_1_1_1_2__deduplicates_repeated_outputs():
+    cfg = validate_config(
+        _valid_raw({"outputs": ["stdout", "file:/tmp/x.log", "stdout", "file:/tmp/x.log"]})
+    )
+    assert cfg.outputs == ["stdout", "file:/tmp/x.log"]
+    assert cfg.parsed_outputs == [StdoutSpec(), FileSpec("/tmp/x.log")]
+    print("✅test_FR_1_1_1_2__deduplicates_repeated_outputs passed")
+
+
+# This test checks if the validated config snapshots into a frozen runtime view.
+def test_FR_1_1_1_2__to_runtime_snapshots_validated_config():
+    cfg = validate_config(_valid_raw())
+    rt = cfg.to_runtime()
+    assert (rt.lat, rt.lon, rt.min_elevation_deg) == (37.8, -122.4, 10.0)
+    assert rt.sat_items == ((25544, "blue"), (48915, "pink"))
+    assert dict(rt.satellites) == cfg.satellites
+    assert rt.parsed_outputs == tuple(cfg.parsed_outputs)
+    # One shared pair object per satellite, reused by sat_items and pair_by_id.
+    assert rt.pair_by_id[25544] is rt.sat_items[0]
+    assert rt.pair_by_id[48915] == (48915, "pink")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        rt.lat = 0.0  # type: ignore[misc]
+    print("✅test_FR_1_1_1_2__to_runtime_snapshots_validated_config passed")
+
+
+# This test checks if the derived views follow a copy whose fields were replaced without validation.
+def test_FR_1_1_1_2__derived_views_follow_model_copy_updates():
+    cfg = validate_config(_valid_raw({"outputs": ["stdout"], "satellites": {1: "a"}}))
+    pair = cfg.pair_by_id[1]
+    assert cfg.pair_by_id[1] is pair  # stable across accesses while satellites is unchanged
+    c = cfg.model_copy(update={"outputs": ["stdout", "file:/tmp/x"], "satellites": {2: "b"}})
+    assert c.parsed_outputs == [StdoutSpec(), FileSpec("/tmp/x")]
+    assert dict(c.pair_by_id) == {2: (2, "b")}
+    assert c.to_runtime().sat_items == ((2, "b"),)
+    c.outputs = ["tcp:127.0.0.1:9000"]
+    assert c.parsed_outputs == [TcpSpec("127.0.0.1", 9000)]
+    # The original is untouched.
+    assert cfg.parsed_outputs == [StdoutSpec()]
+    assert cfg.pair_by_id == {1: pair}
+    print("✅test_FR_1_1_1_2__derived_views_follow_model_copy_updates passed")
+
+
 # This test checks if the validate_config function rejects out of range latitude and longitude.
 def test_FR_1_1_1_2__rejects_out_of_range_lat_lon():
     with pytest.raises(ValidationError):
@@ -55,3 +112,13 @@ def test_FR_1_1_1_2__rejects_empty_satellites_and_bad_keys():
     with pytest.raises(ValidationError):
         _ = validate_config(_valid_raw({"satellites": {25544: ""}}))
     print("✅test_FR_1_1_1_2__rejects_empty_satellites_and_bad_keys passed")
+
+
+# This test checks if cache_file is optional (default None) and rejects an empty path.
+def test_FR_1_1_1_2__cache_file_optional_and_non_empty():
+    assert validate_config(_valid_raw()).cache_file is None
+    cfg = validate_config(_valid_raw({"cache_file": "/tmp/satlight-cache.json"}))
+    assert cfg.to_runtime().cache_file == "/tmp/satlight-cache.json"
+    with pytest.raises(ValidationError):
+        _ = validate_config(_valid_raw({"cache_file": "  "}))
+    print("✅test_FR_1_1_1_2__cache_file_optional_and_non_empty passed")
@@ -1,26 +1,39 @@
 from __future__ import annotations
 
+import io
 from urllib.parse import urlparse, parse_qs
 
+import orjson
+import pytest
 import requests
 import responses
+from responses import matchers
+from urllib3 import HTTPResponse
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import NewConnectionError, ReadTimeoutError
 
-from src.satlight.api import fetch_next_pass
+from src.satlight.api import RetryAfter, fetch_next_pass
 
 
 # This test checks if the fetch_next_pass function calls the passes endpoint per id with timeout and retry.
 @responses.activate
 def test_FR_1_1_2_1__calls_passes_endpoint_per_id_with_timeout_and_retry():
-    """Technique: mock HTTP (responses). Expect: first call times out, second succeeds."""
+    """
+    Technique: mock HTTP (responses). Expect: first call fails transiently (503), the
+    session adapter's Retry issues the second call, which succeeds. (responses emulates
+    urllib3's status retries; timeout retries use the same Retry budget.)
+    """
     norad_id = 25544
     lat, lon = 37.8, -122.4
     url = f"https://sat.terrestre.ar/passes/{norad_id}"
 
-    # First call -> timeout
+    # First call -> transient server error
     responses.add(
         responses.GET,
         url,
-        body=requests.exceptions.Timeout("simulate timeout"),
+        status=503,
+        body="try again",
+        content_type="text/plain",
     )
 
     # Second call -> valid JSON list with one pass object
@@ -54,6 +67,60 @@ def test_FR_1_1_2_1__calls_passes_endpoint_per_id_with_timeout_and_retry():
     print("\n.✅test_FR_1_1_2_1__calls_passes_endpoint_per_id_with_timeout_and_retry passed")
 
 
+# This test checks if a connection error or read timeout is retried once by the session adapter.
+@pytest.mark.parametrize(
+    "error",
+    [
+        NewConnectionError(None, "simulated connection refused"),  # type: ignore[arg-type]
+        ReadTimeoutError(None, "/passes/25544", "simulated read timeout"),  # type: ignore[arg-type]
+    ],
+    ids=["connection_error", "read_timeout"],
+)
+def test_FR_1_1_2_1__connection_error_and_timeout_are_retried_once(monkeypatch, error):
+    """
+    Technique: fail below the adapter (urllib3's connection pool), since responses replaces
+    HTTPAdapter.send and so bypasses urllib3's exception retries. Expect: the first attempt
+    raises, the Retry issues a second one, which succeeds; a second failure -> None.
+    """
+    payload = orjson.dumps(
+        [
+            {
+                "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+                "culmination": {"utc_timestamp": 1100, "alt": "46.00"},
+                "set": {"utc_timestamp": 1200, "alt": "10.00"},
+                "norad_id": 43013,
+            }
+        ]
+    )
+    outcomes: list = []
+    calls: list[str] = []
+
+    def _make_request(self, conn, method, url, **_kw):
+        calls.append(url)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return HTTPResponse(
+            body=io.BytesIO(outcome),
+            headers={"Content-Type": "application/json"},
+            status=200,
+            preload_content=False,
+        )
+
+    monkeypatch.setattr(HTTPConnectionPool, "_make_request", _make_request)
+
+    outcomes[:] = [error, payload]
+    res = fetch_next_pass(43013, 37.8, -122.4, timeout=0.1)
+    assert res is not None and res["norad_id"] == 43013
+    assert len(calls) == 2
+
+    calls.clear()
+    outcomes[:] = [error, error]
+    assert fetch_next_pass(43013, 37.8, -122.4, timeout=0.1) is None
+    assert len(calls) == 2  # one retry, then give up
+    print("✅test_FR_1_1_2_1__connection_error_and_timeout_are_retried_once passed")
+
+
 # This test checks if the fetch_next_pass function returns None and logs an error if the API returns a non-200 status code.
 @responses.activate
 def test_FR_1_1_2_1__api_error_results_in_not_visible_and_logs_error():
@@ -75,3 +142,187 @@ def test_FR_1_1_2_1__api_error_results_in_not_visible_and_logs_error():
     # Note: Logging to STDERR per C-5 constraint, so we can't easily test log content
     # The function correctly returns None on API errors, which is the main behavior
     print("\n.✅test_FR_1_1_2_1__api_error_results_in_not_visible_and_logs_error passed")
+
+
+# This test checks if the fetch_next_pass function returns None when the request times out.
+@responses.activate
+def test_FR_1_1_2_1__timeout_results_in_not_visible():
+    """Technique: mock HTTP. Expect: timeout surfaced by the adapter -> None (no exception)."""
+    norad_id = 25544
+    url = f"https://sat.terrestre.ar/passes/{norad_id}"
+
+    responses.add(
+        responses.GET,
+        url,
+        body=requests.exceptions.Timeout("simulate timeout"),
+    )
+
+    res = fetch_next_pass(norad_id, 37.8, -122.4, timeout=0.1)
+    assert res is None
+    print("✅test_FR_1_1_2_1__timeout_results_in_not_visible passed")
+
+
+# This test checks if the fetch_next_pass function revalidates with the ETag and reuses the pass on 304.
+@responses.activate
+def test_FR_1_1_2_1__not_modified_reuses_last_pass():
+    """Technique: mock HTTP. Expect: 200 + ETag, then If-None-Match -> 304 -> same pass object."""
+    norad_id = 43013
+    lat, lon = 37.8, -122.4
+    url = f"https://sat.terrestre.ar/passes/{norad_id}"
+    payload = [
+        {
+            "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+            "culmination": {"utc_timestamp": 1100, "alt": "46.00"},
+            "set": {"utc_timestamp": 1200, "alt": "10.00"},
+            "norad_id": norad_id,
+        }
+    ]
+    responses.add(responses.GET, url, json=payload, status=200, headers={"ETag": '"v1"'})
+    responses.add(
+        responses.GET,
+        url,
+        status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"v1"'})],
+    )
+
+    first = fetch_next_pass(norad_id, lat, lon, timeout=0.1)
+    second = fetch_next_pass(norad_id, lat, lon, timeout=0.1)
+    assert first is not None and first["norad_id"] == norad_id
+    assert second == first
+    assert len(responses.calls) == 2
+    print("✅test_FR_1_1_2_1__not_modified_reuses_last_pass passed")
+
+
+# This function builds a well-formed single-pass API payload for norad_id.
+def _pass_payload(norad_id: int) -> list[dict]:
+    return [
+        {
+            "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+            "culmination": {"utc_timestamp": 1100, "alt": "46.00"},
+            "set": {"utc_timestamp": 1200, "alt": "10.00"},
+            "norad_id": norad_id,
+        }
+    ]
+
+
+# This test checks if the fetch_next_pass function hands back the server's Retry-After wait on 429.
+@responses.activate
+def test_FR_1_1_2_1__rate_limited_returns_retry_after():
+    """Technique: mock HTTP. Expect: 429 + Retry-After -> RetryAfter(120), with no retry GET."""
+    norad_id = 25544
+    url = f"https://sat.terrestre.ar/passes/{norad_id}"
+    responses.add(responses.GET, url, status=429, headers={"Retry-After": "120"})
+
+    res = fetch_next_pass(norad_id, 37.8, -122.4, timeout=0.1)
+    assert res == RetryAfter(120.0)
+    assert len(responses.calls) == 1
+    print("✅test_FR_1_1_2_1__rate_limited_returns_retry_after passed")
+
+
+# This test checks if a 503 is retried once, unless it carries Retry-After.
+@responses.activate
+def test_FR_1_1_2_1__unavailable_retries_only_without_retry_after():
+    """Technique: mock HTTP. Expect: bare 503 -> one retry; 503 + Retry-After -> no retry."""
+    url = "https://sat.terrestre.ar/passes/25544"
+    responses.add(responses.GET, url, status=503)
+    responses.add(responses.GET, url, json=_pass_payload(25544), status=200)
+    assert fetch_next_pass(25544, 37.8, -122.4, timeout=0.1) == _pass_payload(25544)[0]
+    assert len(responses.calls) == 2
+
+    responses.reset()
+    responses.add(responses.GET, url, status=503, headers={"Retry-After": "30"})
+    assert fetch_next_pass(25544, 37.8, -122.4, timeout=0.1) == RetryAfter(30.0)
+    assert len(responses.calls) == 1
+    print("✅test_FR_1_1_2_1__unavailable_retries_only_without_retry_after passed")
+
+
+# This test checks if fetch_next_pass reuses one keep-alive Session across calls.
+@responses.activate
+def test_FR_1_1_2_1__reuses_shared_keep_alive_session():
+    """Technique: mock HTTP. Expect: same Session object for every call, keep-alive headers sent."""
+    from src.satlight import api
+
+    for norad_id in (25544, 48915):
+        responses.add(
+            responses.GET,
+            f"https://sat.terrestre.ar/passes/{norad_id}",
+            json=_pass_payload(norad_id),
+            status=200,
+        )
+
+    session = api._get_session()
+    fetch_next_pass(25544, 37.8, -122.4, timeout=0.1)
+    fetch_next_pass(48915, 37.8, -122.4, timeout=0.1)
+    assert api._get_session() is session
+    adapter = session.get_adapter("https://sat.terrestre.ar")
+    assert adapter.max_retries.total == 1  # retries live on the shared adapter
+    for call in responses.calls:
+        assert call.request.headers["Connection"] == "keep-alive"
+        assert call.request.headers["User-Agent"].startswith("satlight/")
+    print("✅test_FR_1_1_2_1__reuses_shared_keep_alive_session passed")
+
+
+# This test checks if the fetch_next_pass function rejects a pass object missing the fields the filter needs.
+@responses.activate
+def test_FR_1_1_2_1__malformed_pass_results_in_not_visible():
+    """Technique: mock HTTP. Expect: 200 with a pass lacking culmination -> None."""
+    norad_id = 25544
+    payload = _pass_payload(norad_id)
+    del payload[0]["culmination"]
+    responses.add(
+        responses.GET, f"https://sat.terrestre.ar/passes/{norad_id}", json=payload, status=200
+    )
+
+    assert fetch_next_pass(norad_id, 37.8, -122.4, timeout=0.1) is None
+    print("✅test_FR_1_1_2_1__malformed_pass_results_in_not_visible passed")
+
+
+# This test checks if the shape check rejects altitudes that are not finite numbers.
+@responses.activate
+def test_FR_1_1_2_1__non_finite_or_non_numeric_alt_is_rejected():
+    """Technique: mock HTTP. Expect: alt "nan" / "inf" / "n/a" -> None (nothing to cache)."""
+    norad_id = 25544
+    url = f"https://sat.terrestre.ar/passes/{norad_id}"
+    for alt in ("nan", "inf", "n/a"):
+        payload = _pass_payload(norad_id)
+        payload[0]["culmination"]["alt"] = alt
+        responses.add(responses.GET, url, json=payload, status=200)
+        assert fetch_next_pass(norad_id, 37.8, -122.4, timeout=0.1) is None
+    print("✅test_FR_1_1_2_1__non_finite_or_non_numeric_alt_is_rejected passed")
+
+
+# This test checks if the shape-failure log line is capped, however large the bad pass object is.
+@responses.activate
+def test_FR_1_1_2_1__malformed_pass_log_is_truncated(monkeypatch):
+    """Technique: mock HTTP + recording logger. Expect: the logged payload is cut to ~200 chars."""
+    from src.satlight import api
+
+    norad_id = 25544
+    payload = _pass_payload(norad_id)
+    del payload[0]["culmination"]
+    payload[0]["junk"] = "x" * 10_000
+    responses.add(
+        responses.GET, f"https://sat.terrestre.ar/passes/{norad_id}", json=payload, status=200
+    )
+    logged: list[str] = []
+    monkeypatch.setattr(api._LOG, "error", lambda msg, *args: logged.append(msg % args))
+
+    assert fetch_next_pass(norad_id, 37.8, -122.4, timeout=0.1) is None
+    assert len(logged) == 1 and len(logged[0]) < 300 and logged[0].endswith("...")
+    print("✅test_FR_1_1_2_1__malformed_pass_log_is_truncated passed")
+
+
+# This test checks if float and numeric-string timestamps pass the shape check, as in the filter.
+@responses.activate
+def test_FR_1_1_2_1__accepts_timestamps_the_filter_can_parse():
+    """Technique: mock HTTP. Expect: utc_timestamp given as float/str is accepted like an int."""
+    norad_id = 25544
+    payload = _pass_payload(norad_id)
+    payload[0]["rise"]["utc_timestamp"] = 1000.0
+    payload[0]["set"]["utc_timestamp"] = "1200"
+    responses.add(
+        responses.GET, f"https://sat.terrestre.ar/passes/{norad_id}", json=payload, status=200
+    )
+
+    assert fetch_next_pass(norad_id, 37.8, -122.4, timeout=0.1) == payload[0]
+    print("✅test_FR_1_1_2_1__accepts_timestamps_the_filter_can_parse passed")
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from functools import partial
+from itertools import repeat
 from typing import Optional, Any, Callable
 
+import pytest
+
 from src.satlight.config import AppConfig
 from src.satlight.visibility import visible_now
 
+MONO_0 = repeat(0.0).__next__  # constant monotonic clock
+
 
 # This function creates a fake fetcher factory.
 def _fake_fetcher_factory(
@@ -47,7 +53,9 @@ def test_FR_1_1_2_2__includes_inside_window_and_peak_ge_min(monkeypatch):
         48915: None,  # simulate API error for the other sat
     }
     fetcher = _fake_fetcher_factory(payload)
-    res = visible_now(_cfg(min_elev=10.0), fetcher=fetcher, now_fn=lambda: float(now))
+    res = visible_now(
+        _cfg(min_elev=10.0), fetcher=fetcher, now_fn=lambda: float(now), mono_fn=lambda: 0.0
+    )
     assert (25544, "blue") in res
     # 48915 absent because fetcher returned None
     assert all(sid != 48915 for sid, _ in res)
@@ -72,7 +80,9 @@ def test_FR_1_1_2_2__excludes_if_peak_below_min_even_when_inside_window(monkeypa
         }
     }
     fetcher = _fake_fetcher_factory(payload)
-    res = visible_now(_cfg(min_elev=10.0), fetcher=fetcher, now_fn=lambda: float(now))
+    res = visible_now(
+        _cfg(min_elev=10.0), fetcher=fetcher, now_fn=lambda: float(now), mono_fn=lambda: 0.0
+    )
     assert res == []
     print("✅test_FR_1_1_2_2__excludes_if_peak_below_min_even_when_inside_window passed")
 
@@ -97,6 +107,7 @@ def test_FR_1_1_2_2__includes_exactly_at_rise_and_set_edges():
         cfg,
         fetcher=_fake_fetcher_factory({25544: pass_obj, 48915: None}),
         now_fn=lambda: float(1000),
+        mono_fn=lambda: 0.0,
     )
     assert (25544, "blue") in res1
 
@@ -105,6 +116,7 @@ def test_FR_1_1_2_2__includes_exactly_at_rise_and_set_edges():
         cfg,
         fetcher=_fake_fetcher_factory({25544: pass_obj}),
         now_fn=lambda: float(2000),
+        mono_fn=lambda: 0.0,
     )
     assert (25544, "blue") in res2
     print("✅test_FR_1_1_2_2__includes_exactly_at_rise_and_set_edges passed")
@@ -127,7 +139,517 @@ def test_FR_1_1_2_3__maps_ids_to_configured_colors_and_returns_list_of_pairs():
             "norad_id": 48915,
         },
     }
-    res = visible_now(cfg, fetcher=_fake_fetcher_factory(payload), now_fn=lambda: float(1500))
+    res = visible_now(
+        cfg, fetcher=_fake_fetcher_factory(payload), now_fn=lambda: float(1500), mono_fn=lambda: 0.0
+    )
     # Only the first should pass; and it must carry the configured color
     assert res == [(25544, "blue")]
+    assert res[0] is cfg.pair_by_id[25544]  # the config's prebuilt pair, not a new tuple
     print("✅test_FR_1_1_2_3__maps_ids_to_configured_colors_and_returns_list_of_pairs passed")
+
+
+# This test checks if the visible_now function excludes malformed passes (unparseable fields) without raising.
+def test_FR_1_1_2_2__excludes_malformed_pass():
+    from src.satlight.visibility import clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    payload = {
+        25544: {
+            "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+            "culmination": {"utc_timestamp": 1400, "alt": "n/a"},  # unparseable altitude
+            "set": {"utc_timestamp": 2000, "alt": "10.00"},
+            "norad_id": 25544,
+        },
+        48915: {"rise": {"utc_timestamp": 1000}},  # no culmination/set at all
+    }
+    res = visible_now(
+        _cfg(min_elev=10.0),
+        fetcher=_fake_fetcher_factory(payload),
+        now_fn=lambda: 1500.0,
+        mono_fn=lambda: 0.0,
+    )
+    assert res == []
+    print("✅test_FR_1_1_2_2__excludes_malformed_pass passed")
+
+
+# This test checks if non-finite altitudes ("inf"/"nan") exclude the pass instead of raising.
+def test_FR_1_1_2_2__excludes_non_finite_altitudes():
+    from src.satlight.visibility import (
+        _CacheEntry,
+        _PassFields,
+        _entry_window,
+        clear_cache_for_tests,
+    )
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    # Rise/set below the threshold, so the window math interpolates with the non-finite peak.
+    def _pass(norad_id: int, culm_alt: str) -> dict[str, Any]:
+        return {
+            "rise": {"utc_timestamp": 1000, "alt": "5.00"},
+            "culmination": {"utc_timestamp": 1400, "alt": culm_alt},
+            "set": {"utc_timestamp": 2000, "alt": "5.00"},
+            "norad_id": norad_id,
+        }
+
+    fetcher = _fake_fetcher_factory({25544: _pass(25544, "inf"), 48915: _pass(48915, "nan")})
+    for now in (1500.0, 1510.0):  # the second tick reads the cached rows again
+        res = visible_now(
+            _cfg(min_elev=10.0), fetcher=fetcher, now_fn=partial(float, now), mono_fn=MONO_0
+        )
+        assert res == []
+    # The window math itself never raises on a non-finite number: the window is empty.
+    for culm_alt in (float("inf"), float("nan")):
+        entry = _CacheEntry(set_ts=2000, fields=_PassFields(1000, 1400, 2000, 5.0, culm_alt, 5.0))
+        assert _entry_window(entry, 10.0) == (0, -1)
+    print("✅test_FR_1_1_2_2__excludes_non_finite_altitudes passed")
+
+
+# This test checks if a non-finite rise, culmination or set altitude makes the pass unparseable.
+@pytest.mark.parametrize("part", ["rise", "culmination", "set"])
+@pytest.mark.parametrize("alt", ["nan", "inf", "-inf"])
+def test_FR_1_1_2_2__non_finite_altitude_is_malformed(part: str, alt: str):
+    from src.satlight.visibility import _parse_pass_fields, clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    pass_obj: dict[str, Any] = {
+        "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+        "culmination": {"utc_timestamp": 1400, "alt": "46.00"},
+        "set": {"utc_timestamp": 2000, "alt": "10.00"},
+        "norad_id": 25544,
+    }
+    pass_obj[part] = {**pass_obj[part], "alt": alt}
+    assert _parse_pass_fields(pass_obj) is None
+    res = visible_now(
+        _cfg(min_elev=10.0),
+        fetcher=_fake_fetcher_factory({25544: pass_obj}),
+        now_fn=partial(float, 1500.0),
+        mono_fn=MONO_0,
+    )
+    assert res == []
+    print(f"✅test_FR_1_1_2_2__non_finite_altitude_is_malformed[{part}-{alt}] passed")
+
+
+# This test checks if next_state_change_ts reads the schedule (not the cache) and skips stale events.
+def test_FR_1_1_2_2__next_state_change_comes_from_the_schedule(monkeypatch):
+    from src.satlight import visibility
+    from src.satlight.visibility import next_state_change_ts, pop_cache_entry_for_tests
+
+    def _pass(norad_id: int, rise: int, culm: int, set_: int) -> dict[str, Any]:
+        return {
+            "rise": {"utc_timestamp": rise, "alt": "0.00"},
+            "culmination": {"utc_timestamp": culm, "alt": "20.00"},
+            "set": {"utc_timestamp": set_, "alt": "0.00"},
+            "norad_id": norad_id,
+        }
+
+    # Windows at 10 deg: 25544 [1050, 1150] (set 1200), 48915 [1550, 1650] (set 1700).
+    payload = {25544: _pass(25544, 1000, 1100, 1200), 48915: _pass(48915, 1500, 1600, 1700)}
+    assert (
+        visible_now(
+            _cfg(),
+            fetcher=_fake_fetcher_factory(payload),
+            now_fn=partial(float, 900),
+            mono_fn=MONO_0,
+        )
+        == []
+    )
+
+    class _NoScan(dict):
+        def values(self):
+            raise AssertionError("next_state_change_ts scanned the cache")
+
+        items = values
+
+    monkeypatch.setattr(visibility, "_CACHE", _NoScan(visibility._CACHE))
+    assert next_state_change_ts(900, 10.0) == 1050
+    assert next_state_change_ts(1100, 10.0) == 1151  # inside 25544's window: its exit is next
+    assert next_state_change_ts(1160, 10.0) == 1201  # 25544 expires before 48915 enters
+
+    # A forgotten pass leaves stale events and expiry rows behind; they are skipped.
+    pop_cache_entry_for_tests(25544)
+    assert next_state_change_ts(1160, 10.0) == 1550
+    assert next_state_change_ts(1700, 10.0) == 1701
+    assert next_state_change_ts(1701, 10.0) is None
+    print("✅test_FR_1_1_2_2__next_state_change_comes_from_the_schedule passed")
+
+
+# This test checks if the visible_now function re-evaluates a cached pass when min_elevation_deg changes.
+def test_FR_1_1_2_2__cached_window_follows_min_elevation():
+    from src.satlight.visibility import clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    payload = {
+        25544: {
+            "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+            "culmination": {"utc_timestamp": 1400, "alt": "20.00"},
+            "set": {"utc_timestamp": 2000, "alt": "10.00"},
+            "norad_id": 25544,
+        },
+    }
+    res = visible_now(
+        _cfg(min_elev=10.0),
+        fetcher=_fake_fetcher_factory(payload),
+        now_fn=lambda: 1500.0,
+        mono_fn=lambda: 0.0,
+    )
+    assert res == [(25544, "blue")]
+
+    # Same cached pass (no refetch), stricter threshold: peak 20° no longer qualifies.
+    calls: list[int] = []
+
+    def _no_fetch(id_: int, _lat: float, _lon: float) -> None:
+        calls.append(id_)  # the cached pass should be reused instead
+
+    res = visible_now(
+        _cfg(min_elev=30.0), fetcher=_no_fetch, now_fn=lambda: 1500.0, mono_fn=lambda: 0.0
+    )
+    assert res == []
+    assert calls == []
+    print("✅test_FR_1_1_2_2__cached_window_follows_min_elevation passed")
+
+
+# This test checks if the visible_now function waits out a server-requested Retry-After before refetching.
+def test_FR_1_1_2_1__retry_after_sets_backoff():
+    from src.satlight.api import RetryAfter
+    from src.satlight.visibility import clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    calls: list[int] = []
+
+    def _limited(id_: int, _lat: float, _lon: float) -> RetryAfter:
+        calls.append(id_)
+        return RetryAfter(300.0)
+
+    cfg = _cfg(min_elev=10.0)
+    visible_now(cfg, fetcher=_limited, now_fn=lambda: 1500.0, mono_fn=lambda: 0.0)
+    assert sorted(calls) == [25544, 48915]
+
+    # Still inside the requested 300 s: no new calls.
+    visible_now(cfg, fetcher=_limited, now_fn=lambda: 1500.0, mono_fn=lambda: 299.0)
+    assert len(calls) == 2
+
+    # Past it: both are retried.
+    visible_now(cfg, fetcher=_limited, now_fn=lambda: 1500.0, mono_fn=lambda: 301.0)
+    assert len(calls) == 4
+    print("✅test_FR_1_1_2_1__retry_after_sets_backoff passed")
+
+
+# This test checks if the visible_now function admits at most a token bucket's burst of fetches.
+def test_FR_1_1_2_1__token_bucket_limits_fetch_burst():
+    from src.satlight.visibility import clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    calls: list[int] = []
+
+    def _none(id_: int, _lat: float, _lon: float) -> None:
+        calls.append(id_)
+
+    cfg = AppConfig(
+        lat=37.8,
+        lon=-122.4,
+        satellites={i: "blue" for i in range(1, 9)},  # 8 satellites, burst of 5
+        outputs=["stdout"],
+        min_elevation_deg=10.0,
+    )
+    visible_now(cfg, fetcher=_none, now_fn=lambda: 1500.0, mono_fn=lambda: 0.0)
+    assert len(calls) == 5
+
+    # Two seconds later the bucket has refilled two tokens; the rest get their turn.
+    visible_now(cfg, fetcher=_none, now_fn=lambda: 1500.0, mono_fn=lambda: 2.0)
+    assert len(calls) == 7
+    print("✅test_FR_1_1_2_1__token_bucket_limits_fetch_burst passed")
+
+
+# This test checks if cached passes saved to disk are reused after a restart (cache cleared) without refetching.
+def test_FR_1_1_2_2__persisted_cache_survives_restart(tmp_path):
+    from src.satlight.visibility import clear_cache_for_tests, load_cache, save_cache
+
+    clear_cache_for_tests()  # Clear cache before test
+    path = str(tmp_path / "passes.json")
+
+    payload = {
+        25544: {
+            "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+            "culmination": {"utc_timestamp": 1400, "alt": "50.00"},
+            "set": {"utc_timestamp": 2000, "alt": "10.00"},
+            "norad_id": 25544,
+        },
+        48915: {
+            "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+            "culmination": {"utc_timestamp": 1100, "alt": "50.00"},
+            "set": {"utc_timestamp": 1200, "alt": "10.00"},  # sets before the restart
+            "norad_id": 48915,
+        },
+    }
+    visible_now(
+        _cfg(), fetcher=_fake_fetcher_factory(payload), now_fn=lambda: 1100.0, mono_fn=lambda: 0.0
+    )
+    save_cache(path, 1100)
+
+    clear_cache_for_tests()  # "restart"
+    assert load_cache(path, 1500) == 1  # 48915's pass has already set
+
+    calls: list[int] = []
+
+    def _only_48915(id_: int, _lat: float, _lon: float) -> None:
+        calls.append(id_)
+
+    res = visible_now(_cfg(), fetcher=_only_48915, now_fn=lambda: 1500.0, mono_fn=lambda: 0.0)
+    assert res == [(25544, "blue")]
+    assert calls == [48915]  # 25544 came from the persisted cache
+    print("✅test_FR_1_1_2_2__persisted_cache_survives_restart passed")
+
+
+# This test checks if a failed cache save removes its temp file.
+def test_FR_1_1_2_2__failed_cache_save_removes_temp_file(tmp_path):
+    from src.satlight.visibility import save_cache
+
+    path = tmp_path / "passes.json"
+    path.mkdir()  # os.replace onto a directory fails after the temp file is written
+    payload = {
+        25544: {
+            "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+            "culmination": {"utc_timestamp": 1400, "alt": "50.00"},
+            "set": {"utc_timestamp": 2000, "alt": "10.00"},
+            "norad_id": 25544,
+        }
+    }
+    visible_now(
+        _cfg(), fetcher=_fake_fetcher_factory(payload), now_fn=partial(float, 1100), mono_fn=MONO_0
+    )
+    save_cache(str(path), 1100)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["passes.json"]
+    print("✅test_FR_1_1_2_2__failed_cache_save_removes_temp_file passed")
+
+
+# This test checks if load_cache skips malformed rows one by one and loads the rest.
+def test_FR_1_1_2_2__load_cache_skips_malformed_rows(tmp_path):
+    from src.satlight.visibility import _CACHE, load_cache
+
+    path = tmp_path / "passes.json"
+    path.write_text(
+        '{"25544": [1000, 1400, 2000, 10.0, 50.0, 10.0],'
+        ' "1": [1000, 1400],'
+        ' "2": [1000, 1400, 2000, 10.0, "nope", 10.0],'
+        ' "x": [1000, 1400, 2000, 10.0, 50.0, 10.0],'
+        ' "48915": [1000, 1100, 3000, 10.0, 50.0, 10.0]}'
+    )
+    assert load_cache(str(path), 1500) == 2
+    assert sorted(_CACHE) == [25544, 48915]
+    print("✅test_FR_1_1_2_2__load_cache_skips_malformed_rows passed")
+
+
+# This test checks if a cache path that keeps failing is warned about once, not on every tick.
+def test_FR_1_1_2_2__failing_cache_save_warns_once(tmp_path, monkeypatch):
+    from src.satlight import visibility
+    from src.satlight.visibility import save_cache
+
+    path = str(tmp_path / "missing-dir" / "passes.json")  # parent never exists -> OSError
+    warned: list[str] = []
+    monkeypatch.setattr(visibility._LOG, "warning", lambda msg, *args: warned.append(msg % args))
+
+    fetcher = _fake_fetcher_factory(
+        {
+            25544: {
+                "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+                "culmination": {"utc_timestamp": 1400, "alt": "50.00"},
+                "set": {"utc_timestamp": 2000, "alt": "10.00"},
+                "norad_id": 25544,
+            }
+        }
+    )
+    for now in (1100, 1110, 1120):  # three ticks, only the first stores a new pass
+        visible_now(_cfg(), fetcher=fetcher, now_fn=partial(float, now), mono_fn=MONO_0)
+        save_cache(path, now)
+    assert len(warned) == 1 and "could not save pass cache" in warned[0]
+    print("✅test_FR_1_1_2_2__failing_cache_save_warns_once passed")
+
+
+# This test checks if a failed fetch backs off 60 s ±10% before the satellite is retried.
+def test_FR_1_1_2_1__failed_fetch_backs_off_with_bounded_jitter():
+    from src.satlight.visibility import clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    calls: list[int] = []
+
+    def _none(id_: int, _lat: float, _lon: float) -> None:
+        calls.append(id_)
+
+    cfg = _cfg(min_elev=10.0)
+    visible_now(cfg, fetcher=_none, now_fn=lambda: 1500.0, mono_fn=lambda: 0.0)
+    assert len(calls) == 2
+    visible_now(cfg, fetcher=_none, now_fn=lambda: 1500.0, mono_fn=lambda: 53.9)  # < 60 - 10%
+    assert len(calls) == 2
+    visible_now(cfg, fetcher=_none, now_fn=lambda: 1500.0, mono_fn=lambda: 66.1)  # > 60 + 10%
+    assert len(calls) == 4
+    print("✅test_FR_1_1_2_1__failed_fetch_backs_off_with_bounded_jitter passed")
+
+
+# This test checks if a one-fetch budget rotates across satellites tick by tick (round-robin).
+def test_FR_1_1_2_1__fetch_budget_rotates_round_robin():
+    from src.satlight.visibility import clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    calls: list[int] = []
+
+    def _none(id_: int, _lat: float, _lon: float) -> None:
+        calls.append(id_)
+
+    cfg = AppConfig(
+        lat=37.8,
+        lon=-122.4,
+        satellites={1: "red", 2: "green", 3: "blue"},
+        outputs=["stdout"],
+        min_elevation_deg=10.0,
+    )
+    for tick in range(3):
+        visible_now(
+            cfg,
+            fetcher=_none,
+            now_fn=lambda: 1500.0,
+            mono_fn=partial(float, tick),
+            max_fetches_per_tick=1,
+        )
+    assert calls == [1, 2, 3]
+    print("✅test_FR_1_1_2_1__fetch_budget_rotates_round_robin passed")
+
+
+# This test checks if a cached pass is reused up to its set time and refetched right after.
+def test_FR_1_1_2_1__refetches_once_cached_pass_has_set():
+    from src.satlight.visibility import clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    calls: list[int] = []
+    pass_obj = {
+        "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+        "culmination": {"utc_timestamp": 1400, "alt": "50.00"},
+        "set": {"utc_timestamp": 2000, "alt": "10.00"},
+        "norad_id": 25544,
+    }
+
+    def _fetch(id_: int, _lat: float, _lon: float) -> Optional[dict[str, Any]]:
+        calls.append(id_)
+        return pass_obj if id_ == 25544 else None
+
+    cfg = _cfg(min_elev=10.0)
+    for now in (1500.0, 2000.0):  # second tick: exactly at set, still cached
+        visible_now(cfg, fetcher=_fetch, now_fn=partial(float, now), mono_fn=MONO_0)
+    assert calls.count(25544) == 1
+
+    res = visible_now(cfg, fetcher=_fetch, now_fn=lambda: 2001.0, mono_fn=lambda: 0.0)
+    assert calls.count(25544) == 2
+    assert res == []  # the refetched pass (same one) has set as well
+    print("✅test_FR_1_1_2_1__refetches_once_cached_pass_has_set passed")
+
+
+# This test checks if pop_cache_entry_for_tests forgets one satellite only, so just that one is refetched.
+def test_FR_1_1_2_1__popped_entry_is_refetched():
+    from src.satlight.visibility import pop_cache_entry_for_tests
+
+    calls: list[int] = []
+    pass_obj = {
+        "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+        "culmination": {"utc_timestamp": 1400, "alt": "50.00"},
+        "set": {"utc_timestamp": 2000, "alt": "10.00"},
+    }
+
+    def _fetch(id_: int, _lat: float, _lon: float) -> Optional[dict[str, Any]]:
+        calls.append(id_)
+        return pass_obj
+
+    cfg = _cfg(min_elev=10.0)
+    assert visible_now(cfg, fetcher=_fetch, now_fn=lambda: 1500.0, mono_fn=lambda: 0.0) == [
+        (25544, "blue"),
+        (48915, "pink"),
+    ]
+    assert pop_cache_entry_for_tests(25544) is True
+    assert pop_cache_entry_for_tests(25544) is False  # already gone
+
+    res = visible_now(cfg, fetcher=_fetch, now_fn=lambda: 1510.0, mono_fn=lambda: 0.0)
+    assert res == [(25544, "blue"), (48915, "pink")]
+    assert sorted(calls) == [25544, 25544, 48915]  # 48915 stayed cached
+    print("✅test_FR_1_1_2_1__popped_entry_is_refetched passed")
+
+
+# This test checks if a slow fetch does not hold up the tick and its result is used on a later tick.
+def test_FR_1_1_2_1__slow_fetch_lands_on_a_later_tick():
+    import threading
+
+    from src.satlight import visibility
+    from src.satlight.visibility import clear_cache_for_tests
+
+    clear_cache_for_tests()  # Clear cache before test
+
+    release = threading.Event()
+    calls: list[int] = []
+    pass_obj = {
+        "rise": {"utc_timestamp": 1000, "alt": "10.00"},
+        "culmination": {"utc_timestamp": 1400, "alt": "50.00"},
+        "set": {"utc_timestamp": 2000, "alt": "10.00"},
+        "norad_id": 25544,
+    }
+
+    def _slow(id_: int, _lat: float, _lon: float) -> Optional[dict[str, Any]]:
+        calls.append(id_)
+        release.wait(5.0)
+        return pass_obj
+
+    cfg = AppConfig(
+        lat=37.8, lon=-122.4, satellites={25544: "blue"}, outputs=["stdout"], min_elevation_deg=10.0
+    )
+    assert (
+        visible_now(
+            cfg, fetcher=_slow, now_fn=lambda: 1500.0, mono_fn=lambda: 0.0, fetch_wait_sec=0.01
+        )
+        == []
+    )
+    # Still in flight: the next tick neither waits for it nor starts a second fetch.
+    assert (
+        visible_now(
+            cfg, fetcher=_slow, now_fn=lambda: 1510.0, mono_fn=lambda: 0.0, fetch_wait_sec=0.01
+        )
+        == []
+    )
+    assert calls == [25544]
+
+    release.set()
+    visibility._INFLIGHT[25544].result(timeout=5.0)
+    res = visible_now(
+        cfg, fetcher=_slow, now_fn=lambda: 1520.0, mono_fn=lambda: 0.0, fetch_wait_sec=0.01
+    )
+    assert res == [(25544, "blue")]
+    assert calls == [25544]
+    print("✅test_FR_1_1_2_1__slow_fetch_lands_on_a_later_tick passed")
+
+
+# This test checks if a window_provider decides overhead directly (inclusive edges), with no fetch.
+def test_FR_1_1_2_2__window_provider_bypasses_fetch_and_interpolation():
+    calls: list[int] = []
+
+    def _fetch(id_: int, _lat: float, _lon: float) -> None:
+        calls.append(id_)
+
+    windows = {25544: (1042, 1158), 48915: (1100, 1200)}
+    cfg = _cfg(min_elev=10.0)
+    seen = [
+        visible_now(
+            cfg,
+            fetcher=_fetch,
+            now_fn=partial(float, now),
+            mono_fn=MONO_0,
+            window_provider=lambda _cfg, sat_id: windows[sat_id],
+        )
+        for now in (1041.0, 1042.0, 1158.0, 1159.0)
+    ]
+    assert seen == [[], [(25544, "blue")], [(25544, "blue"), (48915, "pink")], [(48915, "pink")]]
+    assert calls == []
+    print("✅test_FR_1_1_2_2__window_provider_bypasses_fetch_and_interpolation passed")
@@ -21,3 +21,11 @@ def test_FR_1_2_1__empty_input_returns_empty_string():
 def test_FR_1_2_1__single_item_formats_without_trailing_comma():
     assert format_line([(25544, "blue")]) == "25544: blue"
     print("✅test_FR_1_2_1__single_item_formats_without_trailing_comma passed")
+
+
+# This test checks if the small-count fast paths and the general path format identically.
+def test_FR_1_2_1__fast_paths_match_general_join():
+    assert format_line([(25544, "blue"), (48915, "pink")]) == "25544: blue, 48915: pink"
+    three = [(48915, "pink"), (1, "red"), (25544, "blue")]
+    assert format_line(three) == "1: red, 25544: blue, 48915: pink"
+    print("✅test_FR_1_2_1__fast_paths_match_general_join passed")
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import socket
+
+import src.satlight.sinks as sinks_mod
+
+
+# This function opens a listening TCP socket on an ephemeral localhost port.
+def _listener() -> socket.socket:
+    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    srv.bind(("127.0.0.1", 0))
+    srv.listen(2)
+    srv.settimeout(2.0)
+    return srv
+
+
+# This function reads exactly n newline-terminated lines from a connection.
+def _read_lines(conn: socket.socket, n: int) -> list[str]:
+    buf = b""
+    while buf.count(b"\n") < n:
+        chunk = conn.recv(1024)
+        if not chunk:
+            break
+        buf += chunk
+    return buf.decode("utf-8").splitlines()
+
+
+# This test checks if the TCP sink reuses one connection across lines.
+def test_C_6__tcp_sink_reuses_connection_across_lines():
+    srv = _listener()
+    host, port = srv.getsockname()
+    try:
+        sinks_mod.tcp_sink(host, port, b"25544: blue\n")
+        conn, _ = srv.accept()
+        sinks_mod.tcp_sink(host, port, b"25544: blue, 48915: pink\n")
+        assert _read_lines(conn, 2) == ["25544: blue", "25544: blue, 48915: pink"]
+        conn.close()
+    finally:
+        sinks_mod.close_tcp_connections()
+        srv.close()
+    print("\n.✅test_C_6__tcp_sink_reuses_connection_across_lines passed")
+
+
+# This test checks if the TCP sink reconnects after the peer closes the pooled connection.
+def test_C_6__tcp_sink_reconnects_after_peer_close():
+    srv = _listener()
+    host, port = srv.getsockname()
+    try:
+        sinks_mod.tcp_sink(host, port, b"first\n")
+        conn1, _ = srv.accept()
+        assert _read_lines(conn1, 1) == ["first"]
+        conn1.close()  # peer drops the connection
+
+        sinks_mod.tcp_sink(host, port, b"second\n")
+        conn2, _ = srv.accept()
+        assert _read_lines(conn2, 1) == ["second"]
+        conn2.close()
+    finally:
+        sinks_mod.close_tcp_connections()
+        srv.close()
+    print("✅test_C_6__tcp_sink_reconnects_after_peer_close passed")
+
+
+# This test checks if the file sink appends lines and reopens the file after it is removed.
+def test_C_6__file_sink_appends_and_reopens_after_removal(tmp_path):
+    p = tmp_path / "passes.log"
+    try:
+        sinks_mod.file_sink(str(p), "25544: blue")
+        sinks_mod.file_sink(str(p), "48915: pink")
+        sinks_mod.flush_sinks()
+        assert p.read_text(encoding="utf-8") == "25544: blue\n48915: pink\n"
+
+        p.unlink()  # e.g. `make clean-outputfile` while the service runs
+        sinks_mod.file_sink(str(p), "43013: teal")
+        sinks_mod.flush_sinks()
+        assert p.read_text(encoding="utf-8") == "43013: teal\n"
+    finally:
+        sinks_mod.close_files()
+    print("✅test_C_6__file_sink_appends_and_reopens_after_removal passed")
@@ -1,6 +1,11 @@
+from functools import partial
+from itertools import repeat
+from types import MappingProxyType
 from typing import Dict, Any
 
-from src.satlight.visibility import visible_now, clear_cache_for_tests
+import pytest
+
+from src.satlight.visibility import next_state_change_ts, visible_now
 from src.satlight.config import AppConfig
 
 
@@ -9,14 +14,52 @@ def _make_pass(
     rise_ts: int, culm_ts: int, set_ts: int, rise_alt: float, culm_alt: float, set_alt: float
 ) -> Dict[str, Any]:
     return {
-        "rise": {"utc_timestamp": rise_ts, "alt": str(rise_alt)},
-        "culmination": {"utc_timestamp": culm_ts, "alt": str(culm_alt)},
-        "set": {"utc_timestamp": set_ts, "alt": str(set_alt)},
+        "rise": {"utc_timestamp": rise_ts, "alt": float(rise_alt)},
+        "culmination": {"utc_timestamp": culm_ts, "alt": float(culm_alt)},
+        "set": {"utc_timestamp": set_ts, "alt": float(set_alt)},
         "visible": True,
         "norad_id": 12345,
     }
 
 
+# The standard pass most tests use (rise=1000@10°, peak=1100@46°, set=1200@10°), built once.
+# visible_now only reads it; the read-only inner parts make any accidental mutation fail loudly.
+PASS_STD = {
+    k: MappingProxyType(v) if isinstance(v, dict) else v
+    for k, v in _make_pass(1000, 1100, 1200, 10.0, 46.0, 10.0).items()
+}
+
+
+# This function is a fetcher that returns the same pass for every satellite.
+def _const_fetcher(pass_obj: Any, _id: int, _lat: float, _lon: float) -> Any:
+    return pass_obj
+
+
+STD_FETCHER = partial(_const_fetcher, PASS_STD)  # one fetcher object shared by every test
+MONO_0 = repeat(0.0).__next__  # constant monotonic clock, shared instead of a lambda per call
+
+# The two configurations these tests use: min=25° (window ~[1042, 1158]) and min=28° (crossings
+# exactly at the half-way points, window [1050, 1150]). visible_now only reads them.
+STD_CFG = AppConfig(
+    lat=37.8,
+    lon=-122.4,
+    satellites={12345: "blue"},
+    outputs=["stdout"],
+    min_elevation_deg=25.0,
+)
+EDGES_CFG = AppConfig(
+    lat=0.0,
+    lon=0.0,
+    satellites={12345: "green"},
+    outputs=["stdout"],
+    min_elevation_deg=28.0,
+)
+
+# visible_now with the config, fetcher and clock pre-bound: a test supplies only now_fn.
+_visible = partial(visible_now, STD_CFG, fetcher=STD_FETCHER, mono_fn=MONO_0)
+_visible_edges = partial(visible_now, EDGES_CFG, fetcher=STD_FETCHER, mono_fn=MONO_0)
+
+
 # This test checks if the satellite is not overhead before the threshold.
 def test_interp_before_threshold_no_emit(monkeypatch):
     """
@@ -24,30 +67,9 @@ def test_interp_before_threshold_no_emit(monkeypatch):
     rise=1000@10°, peak=1100@46°, set=1200@10°, min=25°.
     t_enter ≈ 1042, so now=1030 -> no emission.
     """
-    clear_cache_for_tests()
-
-    cfg = AppConfig(
-        lat=37.8,
-        lon=-122.4,
-        satellites={12345: "blue"},
-        outputs=["stdout"],
-        min_elevation_deg=25.0,
-    )
-    pass_obj = _make_pass(1000, 1100, 1200, 10.0, 46.0, 10.0)
-
-    def fake_fetcher(_id: int, _lat: float, _lon: float):
-        return pass_obj
 
     # now before threshold entry
-    now_val = 1030
-    res = visible_now(
-        cfg,
-        fetcher=fake_fetcher,
-        now_fn=lambda: now_val,
-        mono_fn=lambda: 0.0,
-    )
-    assert res == []
-    print("\n.✅test_interp_before_threshold_no_emit passed")
+    assert _visible(now_fn=repeat(1030).__next__) == []
 
 
 # This test checks if the satellite is overhead between the enter and exit times.
@@ -56,78 +78,57 @@ def test_interp_between_enter_and_exit_emit(monkeypatch):
     Inside: t_enter <= now <= t_exit -> we DO emit.
     Using same pass as above; pick now=1100 (at culmination) -> emit.
     """
-    clear_cache_for_tests()
-
-    cfg = AppConfig(
-        lat=37.8,
-        lon=-122.4,
-        satellites={12345: "blue"},
-        outputs=["stdout"],
-        min_elevation_deg=25.0,
-    )
-    pass_obj = _make_pass(1000, 1100, 1200, 10.0, 46.0, 10.0)
-    print("✅test_interp_between_enter_and_exit_emit passed")
-
-    # At t_enter (inclusive)
-    def fake_fetcher(_id: int, _lat: float, _lon: float):
-        return pass_obj
 
-    res = visible_now(
-        cfg,
-        fetcher=fake_fetcher,
-        now_fn=lambda: 1100,  # exactly at peak
-        mono_fn=lambda: 0.0,
-    )
-    assert res == [(12345, "blue")]
-    print("✅test_interp_between_enter_and_exit_emit passed")
+    assert _visible(now_fn=repeat(1100).__next__) == [(12345, "blue")]  # exactly at peak
 
 
 # This test checks if the satellite is overhead at the enter and exit times.
-def test_interp_edges_inclusive():
+@pytest.mark.parametrize(
+    "now_ts,expected",
+    [
+        (1050, [(12345, "green")]),  # at t_enter (inclusive)
+        (1150, [(12345, "green")]),  # at t_exit (inclusive)
+        (1151, []),  # after t_exit (exclusive)
+    ],
+)
+def test_interp_edges_inclusive(now_ts, expected):
     """
     Edge inclusion: choose threshold so the crossings land exactly at half-way points.
     rise=1000@10°, peak=1100@46°, set=1200@10°, pick min=28°.
     Ascend fraction (10->46): (28-10)/(46-10)=18/36=0.5 => t_enter=1050
     Descend fraction (46->10): (46-28)/36=18/36=0.5 => t_exit=1150
     """
-    clear_cache_for_tests()
+    assert _visible_edges(now_fn=repeat(now_ts).__next__) == expected
+
 
-    cfg = AppConfig(
-        lat=0.0,
-        lon=0.0,
-        satellites={12345: "green"},
-        outputs=["stdout"],
-        min_elevation_deg=28.0,
-    )
-    pass_obj = _make_pass(1000, 1100, 1200, 10.0, 46.0, 10.0)
+# This test checks if a cached pass enters and leaves the result on later ticks without refetching.
+def test_interp_cached_pass_follows_window_across_ticks():
+    """
+    One fetch, then ticks before, inside, and after the window [~1042, ~1158]
+    (rise=1000@10°, peak=1100@46°, set=1200@10°, min=25°): the schedule alone decides.
+    """
+    calls = []
 
     def fake_fetcher(_id: int, _lat: float, _lon: float):
-        return pass_obj
-
-    # At t_enter (inclusive)
-    res_enter = visible_now(
-        cfg,
-        fetcher=fake_fetcher,
-        now_fn=lambda: 1050,
-        mono_fn=lambda: 0.0,
-    )
-    assert res_enter == [(12345, "green")]
-
-    # At t_exit (inclusive)
-    res_exit = visible_now(
-        cfg,
-        fetcher=fake_fetcher,
-        now_fn=lambda: 1150,
-        mono_fn=lambda: 0.0,
-    )
-    assert res_exit == [(12345, "green")]
-
-    # After t_exit (exclusive)
-    res_after = visible_now(
-        cfg,
-        fetcher=fake_fetcher,
-        now_fn=lambda: 1151,
-        mono_fn=lambda: 0.0,
-    )
-    assert res_after == []
-    print("✅test_interp_edges_inclusive passed")
+        calls.append(_id)
+        return PASS_STD
+
+    seen = [
+        _visible(fetcher=fake_fetcher, now_fn=repeat(now).__next__)
+        for now in (1000, 1041, 1042, 1100, 1158, 1159, 1190)
+    ]
+    assert seen == [[], [], [(12345, "blue")], [(12345, "blue")], [(12345, "blue")], [], []]
+    assert calls == [12345]  # every tick after the first used the cached pass
+
+
+# This test checks if next_state_change_ts reports the next enter / exit / expiry of a cached pass.
+def test_interp_next_state_change_follows_window_then_set():
+    """Window [1042, 1158] inside set=1200: next events are 1042, then 1159, then 1201, then none."""
+    _visible(now_fn=repeat(1000).__next__)
+
+    assert next_state_change_ts(1000, 25.0) == 1042
+    assert next_state_change_ts(1100, 25.0) == 1159
+    assert next_state_change_ts(1170, 25.0) == 1201
+    assert next_state_change_ts(1201, 25.0) is None
+    # Peak below threshold: only the expiry is ahead.
+    assert next_state_change_ts(1000, 50.0) == 1201